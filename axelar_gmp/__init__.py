@@ -0,0 +1 @@
+"""Data layer for the Axelar GMP dashboard (no Streamlit imports)."""
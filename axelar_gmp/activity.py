@@ -0,0 +1,56 @@
+"""Per-user, per-day activity table behind the user-distribution panels.
+
+One row per (day, user_code, route_code) with the number of transactions.
+Routes are small integer codes from a ``CodeDictionary``; calls with an
+unknown source or destination chain get ``NULL_ROUTE``.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+ROUTE_SEP = "➡"
+NULL_ROUTE = np.iinfo(np.uint16).max
+
+ACTIVITY_SCHEMA = pa.schema([
+    ("day", pa.timestamp("us")),
+    ("user_code", pa.uint32()),
+    ("route_code", pa.uint16()),
+    ("tx_count", pa.uint32()),
+])
+
+
+def build_activity(gmp, users, routes):
+    df = gmp[gmp["user"].notna()]
+    route = df["source_chain"] + ROUTE_SEP + df["destination_chain"]
+    route_code = np.full(len(df), NULL_ROUTE, dtype=np.uint16)
+    known = route.notna().to_numpy()
+    route_code[known] = routes.encode(route[known])
+    activity = pd.DataFrame({
+        "day": df["created_at"].dt.normalize().to_numpy(),
+        "user_code": users.encode(df["user"]),
+        "route_code": route_code,
+    })
+    activity = activity.groupby(["day", "user_code", "route_code"], as_index=False).size()
+    return activity.rename(columns={"size": "tx_count"})
+
+
+def _per_user_distinct(user_codes, other_codes, size):
+    """Number of distinct ``other_codes`` per user, as a dense array over user codes."""
+    pairs = np.unique(user_codes.astype(np.uint64) << np.uint64(32) | other_codes.astype(np.uint64))
+    return np.bincount((pairs >> np.uint64(32)).astype(np.intp), minlength=size)
+
+
+def user_activity_counts(activity):
+    """Per active user: ``(transactions, active days, distinct routes)`` in one pass."""
+    user_codes = activity["user_code"].to_numpy()
+    size = int(user_codes.max()) + 1 if user_codes.size else 0
+    txns = np.bincount(user_codes, weights=activity["tx_count"].to_numpy(), minlength=size).astype(np.int64)
+    days = activity["day"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    active_days = _per_user_distinct(user_codes, days - days.min() if days.size else days, size)
+    routes = activity["route_code"].to_numpy()
+    known = routes != NULL_ROUTE
+    paths = _per_user_distinct(user_codes[known], routes[known], size)
+
+    active = txns > 0
+    return txns[active], active_days[active], paths[active]
@@ -0,0 +1,109 @@
+"""Warehouse backends the local store is synced from.
+
+``SnowflakeBackend`` runs the extract on Snowflake through the connection
+pool. ``DuckDBBackend`` runs the same queries, rendered in the DuckDB dialect,
+over a local Parquet copy of ``fact_gmp``, so the dashboard, benchmarks and
+demos work without a Snowflake account.
+
+Both hand out a scheduler with the ``QueryScheduler`` interface
+(``dialect``, ``submit``, ``as_completed``) for ``sync_warehouse``.
+"""
+
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import duckdb
+
+from .extract import sync_warehouse
+from .fetch import conform, to_frame
+from .instrument import result_size
+from .scheduler import QueryScheduler
+from .sql import GMP_SOURCES
+
+BACKENDS = ("snowflake", "duckdb")
+
+
+class SnowflakeBackend:
+    def __init__(self, pool):
+        self.pool = pool
+
+    @contextmanager
+    def scheduler(self, recorder=None):
+        with self.pool.connection() as conn:
+            yield QueryScheduler(conn, recorder=recorder)
+
+
+class DuckDBScheduler:
+    """Runs submitted queries on worker threads, each on its own DuckDB cursor."""
+
+    dialect = "duckdb"
+
+    def __init__(self, conn, workers=4, recorder=None):
+        self.conn = conn
+        self.workers = workers
+        self.recorder = recorder
+        self._pending = {}
+        self._pool = None
+
+    def _run(self, name, query, params, schema):
+        started = time.perf_counter()
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            fetch_started = time.perf_counter()
+            table = cursor.fetch_arrow_table()
+            df = to_frame(conform(table, schema))
+        finally:
+            cursor.close()
+        if self.recorder is not None:
+            done = time.perf_counter()
+            rows, size = result_size(df)
+            self.recorder.record(
+                "query", name,
+                query_id=None,
+                wall_seconds=done - started,
+                fetch_seconds=done - fetch_started,
+                rows=rows,
+                bytes=size,
+            )
+        return df
+
+    def submit(self, name, query, params=None, schema=None):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        future = self._pool.submit(contextvars.copy_context().run, self._run, name, query, params, schema)
+        self._pending[future] = name
+        return name
+
+    def as_completed(self):
+        """Yield ``(name, frame)`` pairs as each submitted query finishes."""
+        try:
+            for future in as_completed(list(self._pending)):
+                yield self._pending.pop(future), future.result()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+
+class DuckDBBackend:
+    """Embedded DuckDB over Parquet files shaped like ``fact_gmp`` (``data`` as JSON text)."""
+
+    def __init__(self, fact_gmp_path, workers=4):
+        self.fact_gmp_path = fact_gmp_path
+        self.workers = workers
+        self.conn = duckdb.connect()
+        path = str(fact_gmp_path).replace("'", "''")
+        self.conn.execute(f"CREATE VIEW {GMP_SOURCES['duckdb']} AS SELECT * FROM read_parquet('{path}')")
+
+    @contextmanager
+    def scheduler(self, recorder=None):
+        yield DuckDBScheduler(self.conn, self.workers, recorder)
+
+
+def sync_backend(backend, store, history_start, today=None, recorder=None):
+    """``sync_warehouse`` through one scheduler of ``backend``."""
+    with backend.scheduler(recorder) as scheduler:
+        sync_warehouse(scheduler, store, history_start, today)
@@ -0,0 +1,57 @@
+"""Cost guard that keeps every panel's work bounded whatever range is picked.
+
+Two budgets, both checked before a panel runs:
+
+* chart points: a timeframe whose buckets over the range would exceed
+  ``max_buckets`` points per series is coarsened (day -> week -> month). The
+  cap sits well above the LTTB point budget (``downsample``), which thins
+  long series for display, so it only bounds the work behind a chart;
+* scanned bytes: ``estimate`` sums, from the store's Parquet footers, what a
+  loader would read. Panels over the row-level table switch to the rollup
+  cube above the byte budget (see ``panels.path_data_from_cube``).
+"""
+
+import math
+
+import pandas as pd
+
+TIMEFRAMES = ("day", "week", "month")
+BUCKET_DAYS = {"day": 1, "week": 7, "month": 365.25 / 12}
+MAX_SCAN_BYTES = 256 * 2**20
+# buckets a series may have per point of the LTTB budget before its timeframe is coarsened
+BUCKETS_PER_POINT = 8
+
+# store tables each byte-guarded loader reads over the selected range (see GMPStore.table_stats);
+# the other panels read rollups whose size does not grow with the row count
+PANEL_SOURCES = {
+    "load_path_data": ("rows",),
+}
+
+
+def buckets(start_date, end_date, timeframe):
+    """Number of ``timeframe`` buckets (points per series) spanned by the range."""
+    days = (pd.Timestamp(end_date) - pd.Timestamp(start_date)).days + 1
+    return max(math.ceil(days / BUCKET_DAYS[timeframe]), 0)
+
+
+def max_buckets(point_budget):
+    """Bucket cap for a chart drawn with ``point_budget`` points."""
+    return BUCKETS_PER_POINT * point_budget
+
+
+def coarsen(timeframe, start_date, end_date, max_buckets):
+    """The finest timeframe, ``timeframe`` or coarser, that stays within ``max_buckets``."""
+    i = TIMEFRAMES.index(timeframe)
+    while i < len(TIMEFRAMES) - 1 and buckets(start_date, end_date, TIMEFRAMES[i]) > max_buckets:
+        i += 1
+    return TIMEFRAMES[i]
+
+
+def estimate(store, loader, start_date, end_date):
+    """``(rows, bytes)`` that ``loader`` would scan from ``store`` for the range."""
+    rows = size = 0
+    for source in PANEL_SOURCES[loader]:
+        source_rows, source_size = store.table_stats(source, start_date, end_date)
+        rows += source_rows
+        size += source_size
+    return rows, size
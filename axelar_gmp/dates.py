@@ -0,0 +1,15 @@
+"""Date helpers shared by the panels and the rollup cube."""
+
+import pandas as pd
+
+
+def truncate(ts, timeframe):
+    """Vectorized ``date_trunc(timeframe, ts)`` (weeks start on Monday)."""
+    if timeframe == "day":
+        return ts.dt.normalize()
+    if timeframe == "week":
+        day = ts.dt.normalize()
+        return day - pd.to_timedelta(day.dt.dayofweek, unit="D")
+    if timeframe == "month":
+        return ts.dt.to_period("M").dt.to_timestamp()
+    raise ValueError(f"Unsupported timeframe: {timeframe!r}")
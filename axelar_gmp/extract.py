@@ -0,0 +1,33 @@
+"""Sync the local store with the normalized GMP extract in the warehouse."""
+
+import pandas as pd
+
+from .sql import GMP_SCHEMA, gmp_query
+
+
+def sync_warehouse(scheduler, store, history_start, today=None):
+    """Bring ``store`` up to date through ``scheduler`` (see backends.py).
+
+    All warehouse work of one sync (every pending backfill month, or the
+    refresh delta) is submitted at once and applied as each query completes.
+    """
+    # one process syncs at a time; the others then find the store current
+    with store.lock:
+        backfilling = store.watermark() is None
+        if backfilling:
+            today = pd.Timestamp(today or pd.Timestamp.now("UTC").tz_localize(None)).normalize()
+            chunks = {f"chunk:{start:%Y-%m}": (start, end) for start, end in store.pending_chunks(history_start, today)}
+        else:
+            chunks = {"delta": store.refresh_window(today)}
+        for name, (start, end) in chunks.items():
+            query, params = gmp_query(start, end, dialect=scheduler.dialect)
+            scheduler.submit(name, query, params, schema=GMP_SCHEMA)
+
+        for name, df in scheduler.as_completed():
+            if backfilling:
+                store.commit_chunk(*chunks[name], df)
+            else:
+                store.commit_refresh(*chunks[name], df)
+
+        if backfilling:
+            store.finish_backfill()
@@ -0,0 +1,38 @@
+"""Arrow-native result fetching.
+
+Results are read from the connector's Arrow result batches instead of the
+DBAPI row path, so no per-row Python tuples are built and column types come
+from an explicit schema rather than pandas inference. A result is fetched
+whole; what bounds memory is the size of each query, e.g. the month chunks
+of a backfill (see ``store.month_chunks``).
+"""
+
+import pyarrow as pa
+
+
+def conform(table, schema):
+    # Snowflake upper-cases unquoted identifiers
+    table = table.rename_columns([name.lower() for name in table.column_names])
+    if schema is None:
+        return table
+    return table.select(schema.names).cast(schema, safe=False)
+
+
+def fetch_arrow(cursor, schema=None):
+    # batches are conformed one by one: their timestamp precision can differ
+    tables = [conform(batch, schema) for batch in cursor.fetch_arrow_batches()]
+    if not tables:
+        if schema is not None:
+            return schema.empty_table()
+        return pa.table({col[0].lower(): pa.array([], pa.null()) for col in cursor.description})
+    return pa.concat_tables(tables)
+
+
+def to_frame(table):
+    # self_destruct frees each Arrow column as soon as it has been converted
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
+def fetch_frame(cursor, schema=None):
+    return to_frame(fetch_arrow(cursor, schema))
+
@@ -0,0 +1,70 @@
+"""Process-wide cache of built Plotly figures.
+
+A figure is keyed by the code of the function that builds it plus a
+fingerprint of its inputs (``pd.util.hash_pandas_object`` for frames), so a
+rerun over unchanged data reuses the figure instead of rebuilding it through
+Plotly Express and re-validating every trace. Numeric trace data stays in
+NumPy arrays, which Plotly serializes as typed arrays rather than JSON lists.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def _code_hash(code, digest):
+    digest.update(code.co_code)
+    # the bytecode refers to globals, attributes and variables by index into these
+    for names in (code.co_names, code.co_varnames, code.co_freevars, code.co_cellvars):
+        digest.update(repr(names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _code_hash(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+def fingerprint(*inputs):
+    """Digest of frames, series and plain values."""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in inputs:
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            frame = value.to_frame() if isinstance(value, pd.Series) else value
+            digest.update(repr(list(frame.columns)).encode())
+            digest.update(repr(frame.dtypes.tolist()).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        else:
+            digest.update(repr(value).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """LRU of figures built by ``build()`` for given ``inputs``.
+
+    ``build`` takes no arguments and reads its inputs from the enclosing scope;
+    every value it depends on has to be passed as an input.
+    Cached figures are shared, so callers must not modify them.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, build, *inputs):
+        digest = hashlib.blake2b(build.__qualname__.encode(), digest_size=16)
+        _code_hash(build.__code__, digest)
+        key = (digest.hexdigest(), fingerprint(*inputs))
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                return self._figures[key]
+        figure = build()
+        with self._lock:
+            self._figures[key] = figure
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
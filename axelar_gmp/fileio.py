@@ -0,0 +1,56 @@
+"""Files shared by the Streamlit server processes of one host.
+
+Every process opens the same store, so writers take a ``FileLock`` around
+read-modify-write cycles and write through ``temp_path`` names that no other
+writer uses before renaming into place.
+"""
+
+import os
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: processes are not coordinated, threads still are
+    fcntl = None
+
+
+def temp_path(path):
+    """A unique hidden name next to ``path``; Parquet dataset discovery skips it."""
+    head, tail = os.path.split(path)
+    return os.path.join(head, f".{tail}.{uuid.uuid4().hex}.tmp")
+
+
+class FileLock:
+    """Exclusive ``flock`` on ``path`` across processes, and a lock across threads; re-entrant."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._lock.release()
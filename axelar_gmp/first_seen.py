@@ -0,0 +1,71 @@
+"""Persistent first-transaction index for the new-user panels.
+
+Indexed by the dense user codes of ``sketch.CodeDictionary``: position ``i``
+holds the first day wallet ``i`` made a GMP call. Every batch of rows written
+to the store lowers these dates in place, so new wallets are picked up as they
+arrive and the whole-history ``min(created_at)`` scan is never needed.
+Updates from every server process are folded into the same file under a
+``FileLock``; readers reload it once another process has rewritten it.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .fileio import FileLock, temp_path
+
+# "never seen"; larger than any real day number
+UNSEEN = np.iinfo(np.int32).max
+
+
+class FirstSeenIndex:
+    def __init__(self, path):
+        self.path = path
+        self._lock = FileLock(path + ".lock")
+        self._days = np.empty(0, dtype=np.int32)
+        self._stamp = None
+        self._reload()
+
+    @property
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _reload(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if (stat.st_mtime_ns, stat.st_size) != self._stamp:
+            self._days = pq.read_table(self.path).column("first_day").to_numpy().astype(np.int32)
+            self._stamp = (stat.st_mtime_ns, stat.st_size)
+
+    def update(self, user_codes, days):
+        """Fold ``(user_code, day)`` observations into the index."""
+        codes = np.asarray(user_codes, dtype=np.int64)
+        if not codes.size:
+            return
+        day_numbers = pd.DatetimeIndex(days).normalize().to_numpy("datetime64[D]").astype(np.int32)
+        with self._lock:
+            self._reload()
+            size = int(codes.max()) + 1
+            if size > self._days.size:
+                self._days = np.concatenate([self._days, np.full(size - self._days.size, UNSEEN, dtype=np.int32)])
+            np.minimum.at(self._days, codes, day_numbers)
+            self._save()
+
+    def _save(self):
+        tmp = temp_path(self.path)
+        pq.write_table(pa.table({"first_day": pa.array(self._days, type=pa.int32())}), tmp)
+        os.replace(tmp, self.path)
+        stat = os.stat(self.path)
+        self._stamp = (stat.st_mtime_ns, stat.st_size)
+
+    def first_txn_dates(self):
+        """First-transaction date of every known wallet."""
+        with self._lock:
+            self._reload()
+        days = self._days[self._days != UNSEEN]
+        return pd.Series(days.astype("datetime64[D]").astype("datetime64[s]"), name="first_txn_date")
@@ -0,0 +1,180 @@
+"""Per-loader and per-query instrumentation.
+
+``Recorder.loader`` wraps a dashboard loader (optionally around a Streamlit
+cache decorator) and records its wall time, rows, result bytes and whether
+the cache hit. Identical concurrent calls, e.g. from sessions opened at the
+same moment, are coalesced into one and recorded as ``cache="coalesced"``.
+Schedulers record each warehouse query with its query ID and fetch time.
+Every record carries the rerun it belongs to (see ``set_rerun``).
+
+Records are kept in a bounded in-memory buffer for the debug panel, appended
+to an optional JSON-lines log and aggregated into Prometheus text-format
+metrics, labelled with the server process they come from.
+"""
+
+import contextvars
+import functools
+import glob
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import pandas as pd
+
+from .fileio import temp_path
+from .singleflight import SingleFlight, canonical_key
+from .supersede import check_superseded
+
+_rerun = contextvars.ContextVar("rerun", default=None)
+_computed = threading.local()
+
+
+def set_rerun(rerun_id):
+    """Tag every later record made in this context (and copies of it) with ``rerun_id``."""
+    _rerun.set(rerun_id)
+
+
+def result_size(result):
+    """``(rows, bytes)`` of a loader result: a frame, a series or a tuple of them."""
+    if isinstance(result, tuple):
+        sizes = [result_size(part) for part in result]
+        return sum(rows for rows, _ in sizes), sum(size for _, size in sizes)
+    if isinstance(result, pd.DataFrame):
+        return len(result), int(result.memory_usage(index=False).sum())
+    if isinstance(result, pd.Series):
+        return len(result), int(result.memory_usage(index=False))
+    return None, None
+
+
+class Recorder:
+    def __init__(self, max_records=2000, log_path=None):
+        self.log_path = log_path
+        self._records = deque(maxlen=max_records)
+        self._totals = defaultdict(float)
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def record(self, kind, name, **fields):
+        entry = {
+            "kind": kind,
+            "name": name,
+            "rerun": _rerun.get(),
+            "at": pd.Timestamp.now("UTC").isoformat(),
+            **fields,
+        }
+        with self._lock:
+            self._records.append(entry)
+            labels = (kind, name, fields.get("cache") or "")
+            self._totals[labels + ("count",)] += 1
+            for field in ("wall_seconds", "fetch_seconds", "rows", "bytes"):
+                if fields.get(field) is not None:
+                    self._totals[labels + (field,)] += fields[field]
+            if self.log_path:
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(entry, default=str) + "\n")
+        return entry
+
+    def records(self, rerun_id=None):
+        with self._lock:
+            records = list(self._records)
+        if rerun_id is not None:
+            records = [r for r in records if r["rerun"] == rerun_id]
+        return records
+
+    # --- Loaders --------------------------------------------------------------------------------------------------
+    def loader(self, cache=None, name=None):
+        """Decorator for a loader; ``cache`` is an optional caching decorator such as ``st.cache_data``.
+
+        A cache hit is detected by the loader body not running. Callers that
+        arrive while an identical call is in flight wait for it instead of
+        running the loader again. Loaders of a superseded rerun do not start.
+        """
+        def decorate(fn):
+            loader_name = name or fn.__name__
+
+            @functools.wraps(fn)
+            def compute(*args, **kwargs):
+                _computed.flag = True
+                return fn(*args, **kwargs)
+
+            cached = cache(compute) if cache is not None else compute
+
+            def run(args, kwargs):
+                outer, _computed.flag = getattr(_computed, "flag", False), False
+                try:
+                    return cached(*args, **kwargs), not _computed.flag
+                finally:
+                    _computed.flag = outer
+
+            @functools.wraps(fn)
+            def call(*args, **kwargs):
+                check_superseded()
+                started = time.perf_counter()
+                (result, hit), shared = self._flight.do(
+                    loader_name, canonical_key(args, kwargs), lambda: run(args, kwargs))
+                if shared and cache is not None:
+                    # the call we waited on filled the cache; take our own copy from it
+                    result, _ = run(args, kwargs)
+                if shared:
+                    status = "coalesced"
+                else:
+                    status = ("hit" if hit else "miss") if cache is not None else None
+                rows, size = result_size(result)
+                self.record(
+                    "loader", loader_name,
+                    wall_seconds=time.perf_counter() - started,
+                    rows=rows,
+                    bytes=size,
+                    cache=status,
+                )
+                return result
+
+            return call
+
+        return decorate
+
+    # --- Prometheus -----------------------------------------------------------------------------------------------
+    def prometheus_text(self):
+        """Totals in the Prometheus text exposition format."""
+        with self._lock:
+            totals = dict(self._totals)
+        metrics = defaultdict(list)
+        for (kind, name, cache, field), value in sorted(totals.items()):
+            metric = f"gmp_{kind}_{'calls' if field == 'count' else field}_total"
+            labels = f'{kind}="{name}"' + (f',cache="{cache}"' if cache else "") + f',pid="{os.getpid()}"'
+            metrics[metric].append(f"{metric}{{{labels}}} {value:g}")
+        lines = []
+        for metric, samples in metrics.items():
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write this process's totals to ``<path stem>-<pid><ext>``, for node_exporter's textfile collector.
+
+        Every server process keeps its own file, replaced atomically; files of
+        processes that have exited are removed.
+        """
+        stem, ext = os.path.splitext(path)
+        own = f"{stem}-{os.getpid()}{ext}"
+        tmp = temp_path(own)
+        with open(tmp, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, own)
+
+        for other in glob.glob(f"{glob.escape(stem)}-*{glob.escape(ext)}"):
+            pid = other[len(stem) + 1:len(other) - len(ext)]
+            if not pid.isdigit():
+                continue
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                try:
+                    os.remove(other)
+                except FileNotFoundError:
+                    pass
+            except PermissionError:
+                # alive, owned by another user
+                pass
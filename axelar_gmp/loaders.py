@@ -0,0 +1,128 @@
+"""The dashboard's loaders, written once against the tables they read.
+
+Every loader takes ``(source, timeframe, start, end)``; ``source`` provides
+the per-day tables. ``StoreSource`` reads them straight from a ``GMPStore``
+(the precompute CLI and the benchmarks), and Main_Dashboard.py passes one
+that reads through its Streamlit caches.
+"""
+
+from . import panels
+from .cost import MAX_SCAN_BYTES, estimate
+
+TXN_DISTRIBUTION_START = "2022-11-01"
+TXN_DISTRIBUTION_END = "2025-08-31"
+
+
+class StoreSource:
+    """The tables of ``store``, read without caching."""
+
+    def __init__(self, store, max_scan_bytes=MAX_SCAN_BYTES):
+        self.store = store
+        self.max_scan_bytes = max_scan_bytes
+
+    def cube(self, start, end):
+        return self.store.read_cube(start, end)
+
+    def user_sets(self, start, end):
+        return self.store.read_user_sets(start, end)
+
+    def activity(self, start, end):
+        return self.store.read_activity(start, end)
+
+    def rows(self, start, end, columns):
+        return self.store.read(start, end, columns)
+
+    def first_txn_dates(self):
+        return self.store.first_seen.first_txn_dates()
+
+    def time_series(self, timeframe, start, end):
+        return load_time_series_data(self, timeframe, start, end)
+
+    def estimate(self, loader, start, end):
+        return estimate(self.store, loader, start, end)
+
+
+def load_kpi_data(source, timeframe, start, end):
+    return panels.kpi_data(source.cube(start, end), source.user_sets(start, end))
+
+
+def load_time_series_data(source, timeframe, start, end):
+    return panels.time_series_data(source.cube(start, end), source.user_sets(start, end), timeframe)
+
+
+def load_quarterly_data(source, timeframe, start, end):
+    return panels.quarterly_data(source.time_series(timeframe, start, end))
+
+
+def load_kpi_data_chains(source, timeframe, start, end):
+    return panels.kpi_data_chains(source.cube(start, end))
+
+
+def load_chain_data_over_time(source, timeframe, start, end):
+    return panels.chain_data_over_time(source.cube(start, end), timeframe)
+
+
+def load_moving_average_data(source, timeframe, start, end):
+    return panels.moving_average_data(source.time_series(timeframe, start, end))
+
+
+def load_txn_distribution(source, timeframe, start, end):
+    # this panel always covers the fixed Nov 2022 - Aug 2025 window
+    return panels.txn_distribution(source.activity(TXN_DISTRIBUTION_START, TXN_DISTRIBUTION_END))
+
+
+def load_new_users_data(source, timeframe, start, end):
+    return panels.new_users_data(source.first_txn_dates(), timeframe, start, end)
+
+
+def load_kpi_data_new_user(source, timeframe, start, end):
+    return panels.kpi_data_new_user(source.first_txn_dates(), start, end)
+
+
+def load_user_distributions(source, timeframe, start, end):
+    return panels.user_distributions(source.activity(start, end))
+
+
+def load_heatmap_data(source, timeframe, start, end):
+    return panels.heatmap_data(source.cube(start, end))
+
+
+def load_path_data(source, timeframe, start, end):
+    # above the scan budget the routes come from the rollup cube, without the median volume
+    _, scan_bytes = source.estimate("load_path_data", start, end)
+    if scan_bytes > source.max_scan_bytes:
+        return panels.path_data_from_cube(source.cube(start, end), source.user_sets(start, end))
+    return panels.path_data(source.rows(start, end, panels.PATH_COLUMNS))
+
+
+def load_source_dest_data(source, timeframe, start, end):
+    return panels.source_dest_data(source.cube(start, end))
+
+
+def load_top_path_data(source, timeframe, start, end):
+    return panels.top_path_data(source.cube(start, end), source.user_sets(start, end))
+
+
+LOADERS = {
+    loader.__name__: loader
+    for loader in (
+        load_kpi_data, load_time_series_data, load_quarterly_data, load_kpi_data_chains,
+        load_chain_data_over_time, load_moving_average_data, load_txn_distribution, load_new_users_data,
+        load_kpi_data_new_user, load_user_distributions, load_heatmap_data, load_path_data,
+        load_source_dest_data, load_top_path_data,
+    )
+}
+
+
+# loaders whose result does not depend on the timeframe
+TIMEFRAME_FREE = {
+    "load_kpi_data", "load_kpi_data_chains", "load_txn_distribution", "load_kpi_data_new_user",
+    "load_user_distributions", "load_heatmap_data", "load_path_data", "load_source_dest_data",
+    "load_top_path_data",
+}
+
+
+def rows_returned(result):
+    if isinstance(result, tuple):
+        return sum(len(part) for part in result)
+    return len(result)
@@ -0,0 +1,239 @@
+"""Dashboard panels computed locally from the normalized GMP extract.
+
+Each function mirrors one of the original ``load_*`` warehouse queries and
+returns a frame with the same column names, so the charts are unchanged.
+Panels that only need additive metrics take the daily rollup cube
+(``cube.build_cube``) instead of the row-level extract; unique-user metrics
+come from unioning the per-day user sets (``sketch.distinct_users``) and the
+user-distribution panels from the per-user activity table (``activity``).
+"""
+
+import numpy as np
+import pandas as pd
+
+from .activity import ROUTE_SEP, user_activity_counts
+from .cube import rollup
+from .dates import truncate
+from .sketch import distinct_users
+
+
+# --- Helpers ------------------------------------------------------------------------------------------------------
+def route(df):
+    return df["source_chain"] + ROUTE_SEP + df["destination_chain"]
+
+
+def _share(counts, labels, label_col):
+    """Bucket per-user counts onto ``labels``; the last label catches everything above."""
+    counts = np.asarray(counts)
+    codes = np.clip(counts[counts > 0], 1, len(labels)) - 1
+    users = np.bincount(codes, minlength=len(labels))
+    df = pd.DataFrame({label_col: labels, "Number of Users": users})
+    df = df[df["Number of Users"] > 0]
+    return df.sort_values("Number of Users", ascending=False, kind="stable").reset_index(drop=True)
+
+
+# --- Overview -----------------------------------------------------------------------------------------------------
+def kpi_data(cube, user_sets):
+    users = distinct_users(user_sets)
+    volume = cube["volume_usd"].sum()
+    return pd.DataFrame({
+        "Total Transactions": [int(cube["tx_count"].sum())],
+        "Unique Users": [users],
+        "Total Volume": [round(volume)],
+        "Average Volume per User": [round(volume / users) if users else 0],
+    })
+
+
+def time_series_data(cube, user_sets, timeframe):
+    out = rollup(cube, ["Date"], timeframe)
+    users = distinct_users(user_sets.assign(Date=truncate(user_sets["day"], timeframe)), ["Date"])
+    out = out.merge(users, on="Date", how="left")
+    return pd.DataFrame({
+        "Date": out["Date"],
+        "Total Transactions": out["tx_count"],
+        "Unique Users": out["users"].fillna(0).astype("int64"),
+        "Total Volume": out["volume_usd"].round(),
+    })
+
+
+# derived from ``time_series_data`` instead of another pass over the cube
+def quarterly_data(time_series):
+    date = time_series["Date"]
+    out = pd.DataFrame({
+        "Date": date,
+        "Quarter": "Q" + date.dt.quarter.astype(str) + "-" + date.dt.year.astype(str),
+        "Total Volume": time_series["Total Volume"],
+    })
+    out["Cumulative Volume"] = out.groupby("Quarter", sort=False)["Total Volume"].cumsum()
+    return out
+
+
+def kpi_data_chains(cube):
+    volume_count = cube["volume_count"].sum()
+    volume_max = cube["volume_max"].max()
+    return pd.DataFrame({
+        "Number of Sources": [cube["source_chain"].nunique()],
+        "Number of Destinations": [cube["destination_chain"].nunique()],
+        "Average Volume": [round(cube["volume_usd"].sum() / volume_count) if volume_count else 0],
+        "Max Volumme": [round(volume_max) if pd.notna(volume_max) else 0],
+    })
+
+
+def chain_data_over_time(cube, timeframe):
+    df = cube.assign(Date=truncate(cube["day"], timeframe))
+    return df.groupby("Date", as_index=False).agg(
+        Sources=("source_chain", "nunique"),
+        Destinations=("destination_chain", "nunique"),
+    )
+
+
+MOVING_AVERAGE_WINDOWS = {"Avg 30 Day Moving": "30D", "Avg 60 Day Moving": "60D", "Avg 90 Day Moving": "90D"}
+
+
+def moving_average_data(time_series):
+    # windows span calendar days, so they mean the same for every timeframe and skip no gaps
+    volume = time_series.set_index("Date")["Total Volume"]
+    out = pd.DataFrame({"Date": time_series["Date"], "USD_VOLUME": time_series["Total Volume"]})
+    for label, window in MOVING_AVERAGE_WINDOWS.items():
+        out[label] = volume.rolling(window, min_periods=1).mean().to_numpy()
+    return out
+
+
+# --- Users --------------------------------------------------------------------------------------------------------
+TXN_CLASSES = ["1 Txn", "2 Txns", "3-5 Txns", "6-10 Txns", "11-15 Txns", "16-25 Txns", "26-50 Txns", ">50 Txns"]
+TXN_CLASS_BINS = [0, 1, 2, 5, 10, 15, 25, 50, np.inf]
+
+
+def txn_distribution(activity):
+    txns, _, _ = user_activity_counts(activity)
+    classes = pd.cut(pd.Series(txns), bins=TXN_CLASS_BINS, labels=TXN_CLASSES)
+    out = classes.value_counts().rename_axis("Class").reset_index(name="Number of Users")
+    out = out[out["Number of Users"] > 0]
+    out["Class"] = out["Class"].astype(str)
+    return out.sort_values("Number of Users", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def new_users_data(first_txn, timeframe, start_date, end_date):
+    """New wallets per period from the first-transaction date of every wallet."""
+    start, end = np.datetime64(pd.Timestamp(start_date).date()), np.datetime64(pd.Timestamp(end_date).date())
+    days = first_txn.to_numpy().astype("datetime64[D]")
+    offsets = (days[(days >= start) & (days <= end)] - start).astype(np.int64)
+    daily = pd.Series(np.bincount(offsets, minlength=max(int((end - start).astype(np.int64)) + 1, 0)),
+                      index=pd.date_range(start, end, freq="D"))
+    daily = daily[daily > 0]
+    out = daily.groupby(truncate(daily.index.to_series(), timeframe)).sum()
+    out = out.rename_axis("Date").reset_index(name="New Users")
+    out["Cumulative New Users"] = out["New Users"].cumsum()
+    return out
+
+
+def kpi_data_new_user(first_txn, start_date, end_date):
+    daily = new_users_data(first_txn, "day", start_date, end_date)["New Users"]
+    return pd.DataFrame({
+        "CUMULATIVE_NEW_USERS": [int(daily.sum())],
+        "AVERAGE_DAILY_NEW_USERS": [round(daily.mean()) if len(daily) else 0],
+    })
+
+
+PIE_TXN_LABELS = ["1 Txn", "2 Txns", "3 Txns", "4 Txn", "5 Txns", "6 Txns", "7 Txn", "8 Txns", "9 Txns", "10 Txns", ">10 Txns"]
+PIE_DAY_LABELS = [f"{n} Day" if n == 1 else f"{n} Days" for n in range(1, 11)] + [">10 Days"]
+PIE_PATH_LABELS = [f"{n} Path" if n == 1 else f"{n} Paths" for n in range(1, 11)] + [">10 Paths"]
+
+
+def user_distributions(activity):
+    """The three "Share of ... by Users" pies (transactions, active days, paths) in one pass."""
+    txns, active_days, paths = user_activity_counts(activity)
+    return (
+        _share(txns, PIE_TXN_LABELS, "Number of Txns"),
+        _share(active_days, PIE_DAY_LABELS, "#Days of Activity"),
+        _share(paths, PIE_PATH_LABELS, "Number of Paths"),
+    )
+
+
+# --- Heatmap ------------------------------------------------------------------------------------------------------
+DAY_NAMES = np.array(["1 - Mon", "2 - Tue", "3 - Wed", "4 - Thu", "5 - Fri", "6 - Sat", "7 - Sun"])
+
+
+def heatmap_data(cube):
+    out = rollup(cube, ["hour", "dow"])
+    return pd.DataFrame({
+        "Hour": out["hour"],
+        "Day": DAY_NAMES[out["dow"].to_numpy()],
+        "Number of Transfers": out["tx_count"],
+        "Volume of Transfers": out["volume_usd"].round(),
+    })
+
+
+# --- Routes -------------------------------------------------------------------------------------------------------
+PATH_COLUMNS = ["created_at", "id", "user", "source_chain", "destination_chain", "amount_usd", "raw_asset"]
+
+
+def path_data(gmp):
+    df = gmp.assign(PATH=route(gmp), day=gmp["created_at"].dt.normalize())
+    out = df.groupby("PATH").agg(**{
+        "Active Days": ("day", "nunique"),
+        "Number of Transfers": ("id", "nunique"),
+        "Number of Users": ("user", "nunique"),
+        "#Transferred Tokens": ("raw_asset", "nunique"),
+        "Volume of Transfers USD": ("amount_usd", "sum"),
+        "Avg Volume USD": ("amount_usd", "mean"),
+        "Median Volume USD": ("amount_usd", "median"),
+        "Max Volume USD": ("amount_usd", "max"),
+    })
+    out.insert(3, "Avg Daily Users", out["Number of Users"] / out["Active Days"])
+    out["Avg Daily Volume USD"] = out["Volume of Transfers USD"] / out["Active Days"]
+    rounded = ["Avg Daily Users", "Volume of Transfers USD", "Avg Volume USD", "Median Volume USD",
+               "Max Volume USD", "Avg Daily Volume USD"]
+    out[rounded] = out[rounded].round()
+    out = out.sort_values("Active Days", ascending=False, kind="stable")
+    return out.reset_index()
+
+
+def path_data_from_cube(cube, user_sets):
+    """``path_data`` from the rollup cube and user sets, for ranges too large to scan row by row.
+
+    Medians need the individual rows, so the "Median Volume USD" column is left out.
+    """
+    keys = ["source_chain", "destination_chain"]
+    out = rollup(cube, keys).merge(distinct_users(user_sets, keys), on=keys, how="left")
+    counts = cube.groupby(keys, dropna=False, as_index=False).agg(days=("day", "nunique"), tokens=("raw_asset", "nunique"))
+    out = out.merge(counts, on=keys)
+    out = pd.DataFrame({
+        "PATH": route(out),
+        "Active Days": out["days"],
+        "Number of Transfers": out["tx_count"],
+        "Number of Users": out["users"].fillna(0).astype("int64"),
+        "#Transferred Tokens": out["tokens"],
+        "Volume of Transfers USD": out["volume_usd"],
+        "Avg Volume USD": out["volume_usd"] / out["volume_count"].where(out["volume_count"] > 0),
+        "Max Volume USD": out["volume_max"],
+    })
+    out.insert(4, "Avg Daily Users", out["Number of Users"] / out["Active Days"])
+    out["Avg Daily Volume USD"] = out["Volume of Transfers USD"] / out["Active Days"]
+    rounded = ["Avg Daily Users", "Volume of Transfers USD", "Avg Volume USD", "Max Volume USD", "Avg Daily Volume USD"]
+    out[rounded] = out[rounded].round()
+    out = out.sort_values(["Active Days", "PATH"], ascending=[False, True], kind="stable")
+    return out.reset_index(drop=True)
+
+
+def source_dest_data(cube):
+    out = rollup(cube[cube["volume_count"] > 0], ["source_chain", "destination_chain"])
+    out = pd.DataFrame({
+        "Source Chain": out["source_chain"],
+        "Destination Chain": out["destination_chain"],
+        "Volume (USD)": out["volume_usd"].round(),
+        "Number of Transactions": out["volume_count"],
+    })
+    return out.sort_values(["Volume (USD)", "Number of Transactions"], ascending=[False, True]).reset_index(drop=True)
+
+
+def top_path_data(cube, user_sets):
+    keys = ["source_chain", "destination_chain"]
+    out = rollup(cube, keys).merge(distinct_users(user_sets, keys), on=keys, how="left")
+    out = pd.DataFrame({
+        "Path": route(out),
+        "Number of Transfers": out["tx_count"],
+        "Number of Users": out["users"].fillna(0).astype("int64"),
+        "Volume of Transfers (USD)": out["volume_usd"].round(),
+    })
+    return out.sort_values("Number of Transfers", ascending=False, kind="stable").reset_index(drop=True)
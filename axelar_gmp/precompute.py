@@ -0,0 +1,62 @@
+"""Sync the store and snapshot every panel for the standard ranges, without Streamlit.
+
+    python -m axelar_gmp.precompute --backend duckdb --duckdb-path 'fact_gmp/*.parquet'
+    python -m axelar_gmp.precompute --backend snowflake --secrets .streamlit/secrets.toml
+
+Meant for cron (or a deploy hook): the dashboard serves the default view from
+the newest snapshot in ``--out`` instead of querying on a cold start. The
+store, backend, user-sketch and scan budget settings must match the dashboard's.
+"""
+
+import argparse
+import time
+import tomllib
+
+import pandas as pd
+
+from .backends import BACKENDS, DuckDBBackend, SnowflakeBackend, sync_backend
+from .cost import MAX_SCAN_BYTES
+from .snapshot import build_snapshot
+from .store import GMPStore
+
+
+def _backend(args):
+    if args.backend == "duckdb":
+        return DuckDBBackend(args.duckdb_path)
+    from .connection import ConnectionPool, connect_snowflake
+
+    with open(args.secrets, "rb") as f:
+        snowflake_secrets = tomllib.load(f)["snowflake"]
+    return SnowflakeBackend(ConnectionPool(lambda: connect_snowflake(snowflake_secrets)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=BACKENDS, default="snowflake")
+    parser.add_argument("--duckdb-path", default="fact_gmp/*.parquet")
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml")
+    parser.add_argument("--store", help="store directory (default: .gmp_store/<backend>)")
+    parser.add_argument("--user-sketch", choices=("exact", "hll"), default="exact")
+    parser.add_argument("--history-start", default="2022-01-01")
+    parser.add_argument("--max-scan-bytes", type=int, default=MAX_SCAN_BYTES, help="the dashboard's gmp_max_scan_bytes")
+    parser.add_argument("--out", default=".gmp_snapshots")
+    parser.add_argument("--keep", type=int, default=3, help="snapshots to keep, including the new one")
+    parser.add_argument("--no-sync", action="store_true", help="snapshot the store as it is")
+    args = parser.parse_args(argv)
+
+    history_start = pd.to_datetime(args.history_start).date()
+    store = GMPStore(args.store or f".gmp_store/{args.backend}", user_sketch=args.user_sketch)
+    if not args.no_sync:
+        started = time.perf_counter()
+        sync_backend(_backend(args), store, history_start)
+        print(f"synced store in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    path, failed = build_snapshot(store, args.out, history_start, keep=args.keep, max_scan_bytes=args.max_scan_bytes)
+    print(f"wrote {path} in {time.perf_counter() - started:.1f}s")
+    for failure in failed:
+        print(f"skipped {failure['loader']} ({failure['preset']}, {failure['timeframe']}): {failure['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Cache of per-day tables that reuses overlapping date windows.
+
+A requested range is split into aligned partitions (whole months, then whole
+ISO weeks inside a month, then single days) and each partition is cached on its
+own; partition boundaries never depend on where the range starts. Moving
+the end date by a day therefore reuses every cached month and week and only
+reads the new edge. This works for the store's per-day tables (rows, cube,
+user sets, activity), whose ranges are exact concatenations of their days.
+Concurrent misses on the same partition are coalesced into a single fetch.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from .singleflight import SingleFlight
+
+
+def partitions(start_date, end_date):
+    """Aligned ``(start, end)`` partitions covering ``[start_date, end_date]``."""
+    day = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize()
+    parts = []
+    while day <= end:
+        month_end = day + pd.offsets.MonthEnd(0)
+        week_end = day + pd.Timedelta(days=6)
+        if day.day == 1 and month_end <= end:
+            parts.append((day, month_end))
+        elif day.dayofweek == 0 and week_end <= min(end, month_end):
+            parts.append((day, week_end))
+        else:
+            parts.append((day, day))
+        day = parts[-1][1] + pd.Timedelta(days=1)
+    return parts
+
+
+class RangeCache:
+    """Size-bounded LRU of partition results with TTLs.
+
+    Partitions that end within ``live_days`` of today may still change (the
+    current day is partial and refreshes rewrite a short lookback window), so
+    they expire after ``live_ttl`` seconds; settled partitions keep for ``ttl``.
+    """
+
+    def __init__(self, ttl=24 * 3600, live_ttl=600, live_days=2, max_bytes=512 * 2**20, recorder=None):
+        self.ttl = ttl
+        self.live_ttl = live_ttl
+        self.live_days = live_days
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._flight = SingleFlight(recorder)
+
+    def _expiry(self, part_end):
+        live_from = pd.Timestamp.now("UTC").tz_localize(None).normalize() - pd.Timedelta(days=self.live_days)
+        return time.monotonic() + (self.live_ttl if part_end >= live_from else self.ttl)
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            frame, expires, _ = entry
+            if expires < time.monotonic():
+                self._evict(key)
+                return None
+            self._entries.move_to_end(key)
+            return frame
+
+    def _store(self, key, frame, part_end):
+        size = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = (frame, self._expiry(part_end), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._evict(next(iter(self._entries)))
+
+    def _evict(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, kind, start_date, end_date, fetch):
+        """``fetch(start, end)`` for the whole range, assembled from cached partitions."""
+        frames = []
+        for part_start, part_end in partitions(start_date, end_date):
+            key = (kind, part_start, part_end)
+            frame = self._lookup(key)
+            if frame is None:
+                frame, shared = self._flight.do(kind, key, lambda: fetch(part_start, part_end))
+                if not shared:
+                    self._store(key, frame, part_end)
+            frames.append(frame)
+        if not frames:
+            return fetch(start_date, end_date)
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,63 @@
+"""Run independent warehouse queries concurrently.
+
+Queries are submitted together with Snowflake's ``execute_async`` and their
+results are collected in completion order, so a batch costs roughly as much
+as its slowest query instead of the sum of all of them.
+"""
+
+import time
+
+from .fetch import fetch_frame
+from .instrument import result_size
+
+
+class QueryScheduler:
+    dialect = "snowflake"
+
+    def __init__(self, conn, poll_interval=0.25, recorder=None):
+        self.conn = conn
+        self.poll_interval = poll_interval
+        self.recorder = recorder
+        self._pending = {}
+        self._schemas = {}
+        self._submitted = {}
+
+    def submit(self, name, query, params=None, schema=None):
+        """Start ``query``; its result is fetched as Arrow and cast to ``schema`` when given."""
+        cursor = self.conn.cursor()
+        cursor.execute_async(query, params)
+        self._pending[name] = cursor.sfqid
+        self._schemas[name] = schema
+        self._submitted[name] = time.perf_counter()
+        return cursor.sfqid
+
+    def _fetch(self, name, query_id):
+        fetch_started = time.perf_counter()
+        cursor = self.conn.cursor()
+        cursor.get_results_from_sfqid(query_id)
+        df = fetch_frame(cursor, self._schemas.pop(name))
+        done = time.perf_counter()
+        if self.recorder is not None:
+            rows, size = result_size(df)
+            self.recorder.record(
+                "query", name,
+                query_id=query_id,
+                wall_seconds=done - self._submitted.pop(name),
+                fetch_seconds=done - fetch_started,
+                rows=rows,
+                bytes=size,
+            )
+        return df
+
+    def as_completed(self):
+        """Yield ``(name, frame)`` pairs as each submitted query finishes."""
+        while self._pending:
+            done = [
+                name for name, query_id in self._pending.items()
+                if not self.conn.is_still_running(self.conn.get_query_status_throw_if_error(query_id))
+            ]
+            if not done:
+                time.sleep(self.poll_interval)
+                continue
+            for name in done:
+                yield name, self._fetch(name, self._pending.pop(name))
@@ -0,0 +1,234 @@
+"""Loader results shared between Streamlit server processes.
+
+``st.cache_data`` lives in one process, so every replica behind a load
+balancer warms its own copy. ``SharedCache.memoize`` puts a second level
+underneath it that every process on the host (``ArrowFileCache``) or in the
+deployment (``RedisCache``) reads:
+
+* keys hash the loader's qualified name, code and canonical arguments, the
+  source of the file defining it and of this package, and a namespace of the
+  caller's settings, so a deploy that changes the dashboard or this package
+  never reads results of the old code (upgraded libraries are not seen; their
+  entries wait out the ``ttl``);
+* values are Arrow IPC: files are written to a temporary directory and
+  renamed into place, and read through a memory map without copying;
+* entries expire after ``ttl`` seconds and the file cache evicts the least
+  recently used entries beyond ``max_bytes``. Redis bounds its memory itself
+  (``maxmemory`` with an LRU policy).
+
+Results that are not a frame or a tuple of frames are not shared.
+"""
+
+import functools
+import glob
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+
+from .figures import _code_hash
+from .singleflight import canonical_key
+
+
+@functools.lru_cache(maxsize=None)
+def _file_hash(path, mtime_ns):
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).digest()
+
+
+@functools.lru_cache(maxsize=None)
+def _package_hash():
+    # modules are imported once, so their source as of the first call is the code running
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))):
+        digest.update(os.path.basename(path).encode())
+        digest.update(_file_hash(path, os.stat(path).st_mtime_ns))
+    return digest.digest()
+
+
+def result_key(fn, args, kwargs, namespace=""):
+    digest = hashlib.blake2b(f"{namespace}\0{fn.__qualname__}".encode(), digest_size=16)
+    _code_hash(fn.__code__, digest)
+    digest.update(_package_hash())
+    try:
+        # e.g. the dashboard script, which is re-run (not re-imported) when it changes
+        path = fn.__code__.co_filename
+        digest.update(_file_hash(path, os.stat(path).st_mtime_ns))
+    except OSError:
+        pass
+    digest.update(repr(canonical_key(args, kwargs)).encode())
+    return digest.hexdigest()
+
+
+def _parts(result):
+    parts = result if isinstance(result, tuple) else (result,)
+    if not parts or not all(isinstance(part, pd.DataFrame) for part in parts):
+        return None
+    try:
+        return [pa.Table.from_pandas(part) for part in parts]
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def _result(tables, is_tuple):
+    frames = tuple(table.to_pandas() for table in tables)
+    return frames if is_tuple else frames[0]
+
+
+class SharedCache:
+    """Common ``memoize`` over ``get(key)`` / ``put(key, result)`` of a backend."""
+
+    def __init__(self, recorder=None, namespace=""):
+        self.recorder = recorder
+        self.namespace = namespace
+
+    def memoize(self, fn):
+        @functools.wraps(fn)
+        def load(*args, **kwargs):
+            key = result_key(fn, args, kwargs, self.namespace)
+            started = time.perf_counter()
+            result = self.get(key)
+            if result is not None:
+                self._record(fn, "hit", started)
+                return result
+            result = fn(*args, **kwargs)
+            self.put(key, result)
+            self._record(fn, "miss", started)
+            return result
+
+        return load
+
+    def _record(self, fn, status, started):
+        if self.recorder is not None:
+            self.recorder.record("shared_cache", fn.__name__, wall_seconds=time.perf_counter() - started, cache=status)
+
+
+class ArrowFileCache(SharedCache):
+    """Entries as ``<root>/<key>/<part>.arrow`` IPC files, shared by the processes of one host.
+
+    A tuple result is stored as ``0.arrow``, ``1.arrow``, ... and a single
+    frame as ``frame.arrow``; the directory's mtime is its last use.
+    """
+
+    def __init__(self, root, ttl=600, max_bytes=2 * 2**30, recorder=None, namespace=""):
+        super().__init__(recorder, namespace)
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def get(self, key):
+        path = os.path.join(self.root, key)
+        try:
+            if time.time() - os.stat(os.path.join(path, ".created")).st_mtime > self.ttl:
+                return None
+            names = sorted((name for name in os.listdir(path) if name.endswith(".arrow")), key=lambda name: (len(name), name))
+            # the tables reference the mapped files; unlinking them later is safe on POSIX
+            tables = [pa.ipc.open_file(pa.memory_map(os.path.join(path, name))).read_all() for name in names]
+            os.utime(path)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        if not tables:
+            return None
+        return _result(tables, names[0] != "frame.arrow")
+
+    def put(self, key, result):
+        tables = _parts(result)
+        if tables is None:
+            return
+        tmp = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            names = [f"{i}.arrow" for i in range(len(tables))] if isinstance(result, tuple) else ["frame.arrow"]
+            for name, table in zip(names, tables):
+                with pa.OSFile(os.path.join(tmp, name), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            open(os.path.join(tmp, ".created"), "w").close()
+            path = os.path.join(self.root, key)
+            shutil.rmtree(path, ignore_errors=True)  # an expired entry
+            os.rename(tmp, path)
+        except OSError:
+            # another process published the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self._evict()
+
+    def _evict(self):
+        with self._evict_lock:
+            entries = []
+            now = time.time()
+            for name in os.listdir(self.root):
+                path = os.path.join(self.root, name)
+                try:
+                    if name.startswith(".tmp-"):
+                        # left behind by a crashed writer
+                        if now - os.stat(path).st_mtime > self.ttl:
+                            shutil.rmtree(path, ignore_errors=True)
+                        continue
+                    if now - os.stat(os.path.join(path, ".created")).st_mtime > self.ttl:
+                        shutil.rmtree(path, ignore_errors=True)
+                        continue
+                    size = sum(entry.stat().st_size for entry in os.scandir(path))
+                    entries.append((os.stat(path).st_mtime, size, path))
+                except FileNotFoundError:
+                    continue
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+
+
+class RedisCache(SharedCache):
+    """Entries as Redis hashes of Arrow IPC streams, shared across hosts (needs ``redis``)."""
+
+    def __init__(self, url, ttl=600, recorder=None, namespace="", prefix="gmp:"):
+        import redis
+
+        super().__init__(recorder, namespace)
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        fields = self.client.hgetall(self.prefix + key)
+        if not fields:
+            return None
+        is_tuple = fields.pop(b"kind") == b"tuple"
+        tables = [pa.ipc.open_stream(pa.py_buffer(fields[name])).read_all() for name in sorted(fields, key=int)]
+        return _result(tables, is_tuple)
+
+    def put(self, key, result):
+        tables = _parts(result)
+        if tables is None:
+            return
+        mapping = {"kind": "tuple" if isinstance(result, tuple) else "frame"}
+        for i, table in enumerate(tables):
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            mapping[str(i)] = sink.getvalue().to_pybytes()
+        # the hash and its expiry are set in one transaction
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self.prefix + key)
+            pipe.hset(self.prefix + key, mapping=mapping)
+            pipe.expire(self.prefix + key, self.ttl)
+            pipe.execute()
+
+
+def open_shared_cache(location, ttl=600, max_bytes=2 * 2**30, recorder=None, namespace=""):
+    """``RedisCache`` for a ``redis://`` / ``rediss://`` URL, else ``ArrowFileCache`` in that directory."""
+    if location.startswith(("redis://", "rediss://")):
+        return RedisCache(location, ttl=ttl, recorder=recorder, namespace=namespace)
+    return ArrowFileCache(location, ttl=ttl, max_bytes=max_bytes, recorder=recorder, namespace=namespace)
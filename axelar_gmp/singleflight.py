@@ -0,0 +1,79 @@
+"""Single-flight coalescing of identical concurrent calls.
+
+The first caller of a key runs the work; callers arriving while it is in
+flight wait for it and share its result (or its exception) instead of
+running the same warehouse or store work again. Nothing is kept once the
+call finishes; caching is left to the caller. A call abandoned because its
+rerun was superseded is retried by the callers still waiting on it.
+"""
+
+import threading
+
+import pandas as pd
+
+from .supersede import Superseded
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def canonical_key(*parts):
+    """Hashable key in which equal dates compare equal whatever their type."""
+    def canonical(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(canonical(v) for v in value)
+        if isinstance(value, dict):
+            return tuple(sorted((k, canonical(v)) for k, v in value.items()))
+        if hasattr(value, "isoformat") and not isinstance(value, str):
+            return pd.Timestamp(value).isoformat()
+        return value
+
+    return canonical(parts)
+
+
+class SingleFlight:
+    """``do(name, key, fn)`` runs ``fn`` once per in-flight ``key``.
+
+    With a ``recorder``, every collapsed duplicate is recorded as a
+    ``"coalesced"`` event named ``name``.
+    """
+
+    def __init__(self, recorder=None):
+        self.recorder = recorder
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, name, key, fn):
+        """``(result, shared)``; ``shared`` is true for callers that waited on another's call."""
+        key = (name, key)
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+
+            if leader:
+                try:
+                    call.result = fn()
+                except BaseException as exc:
+                    call.error = exc
+                    raise
+                finally:
+                    with self._lock:
+                        del self._calls[key]
+                    call.done.set()
+                return call.result, False
+
+            if self.recorder is not None:
+                self.recorder.record("coalesced", name)
+            call.done.wait()
+            if isinstance(call.error, Superseded):
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result, True
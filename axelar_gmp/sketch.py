@@ -0,0 +1,204 @@
+"""Mergeable distinct-user structures.
+
+Wallet addresses are mapped to dense integer codes by a persistent
+``CodeDictionary``. Per (day, source_chain, destination_chain) the store keeps
+either the exact set of user codes or a HyperLogLog sketch of them; both can be
+unioned over any date range locally, so unique-user metrics never need a
+``count(distinct user)`` scan in the warehouse.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .fileio import FileLock, temp_path
+
+SET_KEYS = ["day", "source_chain", "destination_chain"]
+
+USER_SET_SCHEMA = pa.schema([
+    ("day", pa.timestamp("us")),
+    ("source_chain", pa.string()),
+    ("destination_chain", pa.string()),
+    ("user_code", pa.uint32()),
+])
+
+USER_HLL_SCHEMA = pa.schema([
+    ("day", pa.timestamp("us")),
+    ("source_chain", pa.string()),
+    ("destination_chain", pa.string()),
+    ("registers", pa.binary()),
+])
+
+
+# --- Dictionary ---------------------------------------------------------------------------------------------------
+class CodeDictionary:
+    """Append-only ``value -> code`` mapping (wallets, routes) persisted as a single Parquet file.
+
+    Every server process encodes into the same file: under a ``FileLock`` the
+    file is re-read if another process extended it, and new values are
+    appended to it, so a code means the same value in every process.
+    """
+
+    def __init__(self, path, column="user"):
+        self.path = path
+        self.column = column
+        self._lock = FileLock(path + ".lock")
+        self._values = pd.Index([], dtype=object)
+        self._stamp = None
+        self._reload()
+
+    def __len__(self):
+        return len(self._values)
+
+    def _reload(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if (stat.st_mtime_ns, stat.st_size) != self._stamp:
+            self._values = pd.Index(pq.read_table(self.path).column(self.column).to_pandas())
+            self._stamp = (stat.st_mtime_ns, stat.st_size)
+
+    def encode(self, values):
+        """Codes for ``values`` (nulls are dropped by the caller); unseen values are appended."""
+        values = pd.Index(values)
+        with self._lock:
+            self._reload()
+            codes = self._values.get_indexer(values)
+            new = values[codes < 0].unique()
+            if len(new):
+                self._values = self._values.append(new)
+                self._save()
+                codes = self._values.get_indexer(values)
+        return codes.astype(np.uint32)
+
+    def _save(self):
+        tmp = temp_path(self.path)
+        pq.write_table(pa.table({self.column: pa.array(self._values.to_numpy(), type=pa.string())}), tmp)
+        os.replace(tmp, self.path)
+        stat = os.stat(self.path)
+        self._stamp = (stat.st_mtime_ns, stat.st_size)
+
+
+def build_user_sets(gmp, dictionary):
+    """Exact per-day, per-route sets of user codes, one row per member."""
+    df = gmp[gmp["user"].notna()]
+    sets = pd.DataFrame({
+        "day": df["created_at"].dt.normalize(),
+        "source_chain": df["source_chain"],
+        "destination_chain": df["destination_chain"],
+        "user_code": dictionary.encode(df["user"]),
+    })
+    return sets.drop_duplicates().sort_values(SET_KEYS + ["user_code"]).reset_index(drop=True)
+
+
+# --- HyperLogLog --------------------------------------------------------------------------------------------------
+HLL_PRECISION = 12
+
+
+def _mix64(x):
+    # splitmix64 finalizer; uint64 arithmetic wraps
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _bit_length(x):
+    # frexp is exact on each 32-bit half (np.bitwise_count needs NumPy 2)
+    high, low = (x >> np.uint64(32)).astype(np.float64), (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1]).astype(np.uint8)
+
+
+def _hll_cells(codes, p):
+    """Register index and rank of every code."""
+    h = _mix64(np.asarray(codes, dtype=np.uint64))
+    index = (h >> np.uint64(64 - p)).astype(np.uint32)
+    # the sentinel bit caps the rank at 64 - p + 1
+    rest = (h << np.uint64(p)) | np.uint64(1 << (p - 1))
+    return index, np.uint8(65) - _bit_length(rest)
+
+
+def hll_registers(codes, p=HLL_PRECISION):
+    index, rank = _hll_cells(codes, p)
+    registers = np.zeros(1 << p, dtype=np.uint8)
+    np.maximum.at(registers, index, rank)
+    return registers
+
+
+def hll_count(registers):
+    m = registers.size
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)))
+    zeros = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+def build_user_hll(user_sets, p=HLL_PRECISION):
+    """Collapse exact per-day, per-route sets into one HLL sketch each.
+
+    Most (day, route) groups hold a handful of users, so a sketch is stored
+    sparse, as ``uint32`` ``index << 8 | rank`` entries of its non-zero
+    registers, until that is as large as the dense ``2**p`` byte registers.
+    """
+    m = 1 << p
+    groups = user_sets.groupby(SET_KEYS, dropna=False, sort=True)
+    group = groups.ngroup().to_numpy()
+    index, rank = _hll_cells(user_sets["user_code"].to_numpy(), p)
+    # one entry per non-zero register, keeping its highest rank
+    order = np.lexsort((rank, index, group))
+    group, index, rank = group[order], index[order], rank[order]
+    last = np.ones(len(group), dtype=bool)
+    last[:-1] = (group[1:] != group[:-1]) | (index[1:] != index[:-1])
+    group, entries = group[last], (index[last] << np.uint32(8)) | rank[last]
+
+    sketches = []
+    for group_entries in np.split(entries, np.flatnonzero(np.diff(group)) + 1) if len(entries) else []:
+        if len(group_entries) * 4 < m:
+            sketches.append(group_entries.astype("<u4").tobytes())
+        else:
+            registers = np.zeros(m, dtype=np.uint8)
+            registers[group_entries >> np.uint32(8)] = group_entries & np.uint32(0xFF)
+            sketches.append(registers.tobytes())
+    keys = groups.size().index.to_frame(index=False)
+    return keys.assign(registers=pd.Series(sketches, dtype=object))[SET_KEYS + ["registers"]]
+
+
+def hll_union(sketches, p=HLL_PRECISION):
+    """Registers of the union of sparse or dense sketches (see ``build_user_hll``)."""
+    m = 1 << p
+    registers = np.zeros(m, dtype=np.uint8)
+    sparse = []
+    for sketch in sketches:
+        if len(sketch) == m:
+            np.maximum(registers, np.frombuffer(sketch, dtype=np.uint8), out=registers)
+        else:
+            sparse.append(sketch)
+    if sparse:
+        entries = np.frombuffer(b"".join(sparse), dtype="<u4")
+        np.maximum.at(registers, entries >> np.uint32(8), (entries & np.uint32(0xFF)).astype(np.uint8))
+    return registers
+
+
+# --- Unions -------------------------------------------------------------------------------------------------------
+def distinct_users(user_sets, by=()):
+    """Number of distinct users per ``by`` group, unioning the stored sets or sketches.
+
+    ``user_sets`` is what the store returns for a range: exact sets (``user_code``)
+    or HLL sketches (``registers``). With an empty ``by`` the result is a scalar.
+    """
+    by = list(by)
+    if "registers" in user_sets:
+        def union(group):
+            return hll_count(hll_union(group))
+        if not by:
+            return union(user_sets["registers"]) if len(user_sets) else 0
+        return user_sets.groupby(by, dropna=False)["registers"].agg(union).rename("users").reset_index()
+
+    if not by:
+        return int(np.unique(user_sets["user_code"].to_numpy()).size)
+    return user_sets.groupby(by, dropna=False)["user_code"].nunique().rename("users").reset_index()
@@ -0,0 +1,149 @@
+"""Versioned on-disk snapshots of every panel for a set of standard ranges.
+
+Layout::
+
+    <root>/LATEST                               name of the newest snapshot
+    <root>/<YYYYmmddTHHMMSSZ>/manifest.json     {"version", "built_at", "live_from", "entries", "failed"}
+    <root>/<YYYYmmddTHHMMSSZ>/<preset>/<timeframe>/<loader>[.<part>].parquet
+
+A snapshot is written to a temporary directory and published by rewriting
+``LATEST``, so readers never see a half-written one. ``SNAPSHOT_VERSION``
+changes whenever the layout or a panel's shape does; older snapshots are
+then ignored. Days from ``live_from`` on are re-read by the store's next
+refreshes, so entries for ranges ending there (the last N days, year to date,
+all time) are only served while the snapshot is younger than ``live_max_age``.
+"""
+
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from .cost import MAX_SCAN_BYTES
+from .loaders import LOADERS, TIMEFRAME_FREE, StoreSource
+
+SNAPSHOT_VERSION = 3
+TIMEFRAMES = ("day", "week", "month")
+
+# the dashboard's initial date range, so a cold start is served from the snapshot
+DEFAULT_RANGE = (pd.Timestamp("2023-01-01"), pd.Timestamp("2025-08-31"))
+
+
+def presets(today, history_start):
+    """``{name: (start, end)}`` of the standard ranges as of ``today``."""
+    today = pd.Timestamp(today).normalize()
+    return {
+        "default": DEFAULT_RANGE,
+        "last_7_days": (today - pd.Timedelta(days=6), today),
+        "last_30_days": (today - pd.Timedelta(days=29), today),
+        "last_90_days": (today - pd.Timedelta(days=89), today),
+        "ytd": (today.replace(month=1, day=1), today),
+        "all_time": (pd.Timestamp(history_start), today),
+    }
+
+
+def _key(loader, start_date, end_date, timeframe):
+    timeframe = None if loader in TIMEFRAME_FREE else timeframe
+    return loader, f"{pd.Timestamp(start_date):%Y-%m-%d}", f"{pd.Timestamp(end_date):%Y-%m-%d}", timeframe
+
+
+def build_snapshot(store, root, history_start, today=None, keep=3, max_scan_bytes=MAX_SCAN_BYTES):
+    """Compute every loader for every preset and timeframe and publish the result.
+
+    Returns the snapshot's path and the loaders that raised, which are left out.
+    """
+    built_at = pd.Timestamp.now("UTC")
+    today = pd.Timestamp(today or built_at.tz_localize(None)).normalize()
+    watermark = store.watermark()
+    live_from = (watermark.normalize() if watermark is not None else today) - pd.Timedelta(days=store.lookback_days)
+    name = f"{built_at:%Y%m%dT%H%M%SZ}"
+    tmp = os.path.join(root, f".{name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    source = StoreSource(store, max_scan_bytes)
+    entries, failed, done = [], [], set()
+    for preset, (start, end) in presets(today, history_start).items():
+        for timeframe in TIMEFRAMES:
+            for loader, compute in LOADERS.items():
+                key = _key(loader, start, end, timeframe)
+                if key in done:
+                    continue
+                done.add(key)
+                try:
+                    result = compute(source, timeframe, start, end)
+                except Exception as exc:
+                    # e.g. a range without data; the dashboard computes (and reports) it live
+                    failed.append({"loader": loader, "preset": preset, "timeframe": key[3], "error": repr(exc)})
+                    continue
+                parts = result if isinstance(result, tuple) else (result,)
+                folder = os.path.join(preset, key[3] or "any")
+                os.makedirs(os.path.join(tmp, folder), exist_ok=True)
+                files = []
+                for i, part in enumerate(parts):
+                    suffix = f".{i}" if isinstance(result, tuple) else ""
+                    files.append(os.path.join(folder, f"{loader}{suffix}.parquet"))
+                    part.to_parquet(os.path.join(tmp, files[-1]))
+                entries.append({
+                    "loader": loader, "start": key[1], "end": key[2], "timeframe": key[3],
+                    "preset": preset, "files": files, "tuple": isinstance(result, tuple),
+                })
+
+    with open(os.path.join(tmp, "manifest.json"), "w") as f:
+        json.dump({
+            "version": SNAPSHOT_VERSION, "built_at": built_at.isoformat(), "live_from": f"{live_from:%Y-%m-%d}",
+            "entries": entries, "failed": failed,
+        }, f, indent=1)
+    path = os.path.join(root, name)
+    os.replace(tmp, path)
+    latest = os.path.join(root, "LATEST")
+    with open(latest + ".tmp", "w") as f:
+        f.write(name)
+    os.replace(latest + ".tmp", latest)
+
+    older = sorted(d for d in os.listdir(root) if d[:1].isdigit() and d != name)
+    for stale in older[:max(len(older) - (keep - 1), 0)]:
+        shutil.rmtree(os.path.join(root, stale), ignore_errors=True)
+    return path, failed
+
+
+class Snapshot:
+    def __init__(self, path, live_max_age=None):
+        self.path = path
+        self.live_max_age = live_max_age
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        self.version = manifest["version"]
+        self.built_at = pd.Timestamp(manifest["built_at"])
+        self.live_from = manifest["live_from"]
+        self._entries = {
+            (e["loader"], e["start"], e["end"], e["timeframe"]): e for e in manifest["entries"]
+        }
+
+    def get(self, loader, start_date, end_date, timeframe=None):
+        """The precomputed result of ``loader`` for this range, or ``None``."""
+        entry = self._entries.get(_key(loader, start_date, end_date, timeframe))
+        if entry is None:
+            return None
+        if self.live_max_age is not None and entry["end"] >= self.live_from and self.age() > self.live_max_age:
+            # the store has refreshed these days since
+            return None
+        parts = tuple(pd.read_parquet(os.path.join(self.path, file)) for file in entry["files"])
+        return parts if entry["tuple"] else parts[0]
+
+    def age(self):
+        return (pd.Timestamp.now("UTC") - self.built_at).total_seconds()
+
+
+def load_latest(root, max_age=None, live_max_age=None):
+    """The newest snapshot under ``root`` if it is current and young enough, else ``None``."""
+    try:
+        with open(os.path.join(root, "LATEST")) as f:
+            snapshot = Snapshot(os.path.join(root, f.read().strip()), live_max_age)
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
+    if snapshot.version != SNAPSHOT_VERSION:
+        return None
+    if max_age is not None and snapshot.age() > max_age:
+        return None
+    return snapshot
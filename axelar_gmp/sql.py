@@ -0,0 +1,106 @@
+"""Warehouse SQL for the Axelar GMP dashboard.
+
+Every panel is computed from one normalized extract of executed GMP calls, so
+the VARIANT ``data`` column is parsed once per date range instead of once per
+chart.
+
+Queries are generated from the single column definition below with bind
+variables (``qmark`` style) instead of interpolated literals, so the same
+logical query always has the same text and can hit Snowflake's result cache
+across sessions. The same definition renders for DuckDB, where VARIANT paths
+become JSON extraction over the ``data`` text column.
+
+The date range is filtered on the raw ``created_at`` column as a half-open
+timestamp range, so the warehouse can prune micro-partitions (DuckDB: Parquet
+row groups) before any VARIANT path is parsed, and only the requested
+columns' paths are extracted.
+"""
+
+import pandas as pd
+import pyarrow as pa
+
+DIALECTS = ("snowflake", "duckdb")
+
+# the DuckDB engine exposes a local Parquet copy of fact_gmp under this name (see backends.py)
+GMP_SOURCES = {
+    "snowflake": "axelar.axelscan.fact_gmp",
+    "duckdb": "fact_gmp",
+}
+GMP_FILTERS = [
+    "status = 'executed'",
+    "simplified_status = 'received'",
+]
+
+
+def _json_path(path):
+    return "$." + path.replace(":", ".")
+
+
+def _variant(path, dialect):
+    # ``data:<path>`` as a string; the DuckDB copy stores ``data`` as JSON text
+    if dialect == "duckdb":
+        return f"json_extract_string(data, '{_json_path(path)}')"
+    return f"data:{path}::STRING"
+
+
+def _number(path, dialect):
+    # scalar VARIANT values that parse as a number, NULL for arrays, objects and text
+    if dialect == "duckdb":
+        return (
+            f"CASE WHEN json_type(data, '{_json_path(path)}') IN ('ARRAY', 'OBJECT') THEN NULL "
+            f"ELSE TRY_CAST({_variant(path, dialect)} AS DOUBLE) END"
+        )
+    return f"CASE WHEN IS_ARRAY(data:{path}) OR IS_OBJECT(data:{path}) THEN NULL ELSE TRY_TO_DOUBLE(data:{path}::STRING) END"
+
+
+# --- Normalized GMP columns ---------------------------------------------------------------------------------------
+def gmp_expressions(dialect="snowflake"):
+    """Column name -> SQL expression over fact_gmp in ``dialect``."""
+    if dialect not in DIALECTS:
+        raise ValueError(f"Unsupported dialect: {dialect!r}")
+    return {
+        "created_at": "created_at",
+        "id": "id",
+        "user": _variant("call.transaction.from", dialect),
+        "source_chain": f"LOWER({_variant('call.chain', dialect)})",
+        "destination_chain": f"LOWER({_variant('call.returnValues.destinationChain', dialect)})",
+        "amount_usd": _number("value", dialect),
+        "fee": (
+            f"COALESCE({_number('gas:gas_used_amount', dialect)} * {_number('gas_price_rate:source_token.token_price.usd', dialect)}, "
+            f"{_number('fees:express_fee_usd', dialect)})"
+        ),
+        "raw_asset": _variant("symbol", dialect),
+    }
+
+
+GMP_SCHEMA = pa.schema([
+    ("created_at", pa.timestamp("us")),
+    ("id", pa.string()),
+    ("user", pa.string()),
+    ("source_chain", pa.string()),
+    ("destination_chain", pa.string()),
+    ("amount_usd", pa.float64()),
+    ("fee", pa.float64()),
+    ("raw_asset", pa.string()),
+])
+GMP_COLUMNS = GMP_SCHEMA.names
+
+
+def gmp_schema(columns=GMP_COLUMNS):
+    """``GMP_SCHEMA`` narrowed to ``columns``, in that order."""
+    return pa.schema([GMP_SCHEMA.field(name) for name in columns])
+
+
+# --- Query builder ------------------------------------------------------------------------------------------------
+def gmp_query(start_date, end_date, columns=GMP_COLUMNS, dialect="snowflake"):
+    """Normalized GMP rows created on days ``start_date`` through ``end_date`` as ``(sql, params)``."""
+    expressions = gmp_expressions(dialect)
+    select = ",\n  ".join(
+        name if expressions[name] == name else f"{expressions[name]} AS {name}" for name in columns
+    )
+    # created_at::date would hide the column from partition pruning; compare it uncast instead
+    where = "\n  AND ".join(["created_at >= ?", "created_at < ?"] + GMP_FILTERS)
+    sql = f"SELECT\n  {select}\nFROM {GMP_SOURCES[dialect]}\nWHERE {where}"
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+    return sql, (start.to_pydatetime(), end.to_pydatetime())
@@ -0,0 +1,293 @@
+"""On-disk Parquet store of normalized GMP rows, partitioned by day.
+
+Layout::
+
+    <root>/day=YYYY-MM-DD/part.parquet
+    <root>/_cube/day=YYYY-MM-DD/part.parquet        daily rollup cube (see cube.py)
+    <root>/_users/day=YYYY-MM-DD/part.parquet       per-route user sets (see sketch.py)
+    <root>/_users_hll/day=YYYY-MM-DD/part.parquet   the same as HLL sketches
+    <root>/_activity/day=YYYY-MM-DD/part.parquet    per-user activity (see activity.py)
+    <root>/_user_dictionary.parquet
+    <root>/_route_dictionary.parquet
+    <root>/_first_seen.parquet                      first day per wallet (see first_seen.py)
+    <root>/_state.json        {"watermark": ..., "backfilled": {"YYYY-MM": "YYYY-MM-DD", ...}}
+    <root>/_lock              held by the process syncing the store (see fileio.FileLock)
+
+The store tracks a high-water mark on ``created_at``. A refresh re-fetches
+only the days from the watermark onwards (``refresh_window``), a backfill loads
+history in month-sized chunks (``pending_chunks``) that can run in parallel and
+resume after an interruption; ``extract.sync_warehouse`` drives both.
+Every server process opens the same store: one of them syncs it at a time
+(``GMPStore.lock``) and files are replaced atomically, so readers never see a
+partial write.
+"""
+
+import json
+import os
+import shutil
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .activity import ACTIVITY_SCHEMA, build_activity
+from .cube import CUBE_SCHEMA, build_cube
+from .fileio import FileLock, temp_path
+from .first_seen import FirstSeenIndex
+from .sketch import USER_HLL_SCHEMA, USER_SET_SCHEMA, CodeDictionary, build_user_hll, build_user_sets
+from .sql import GMP_COLUMNS, GMP_SCHEMA, gmp_schema
+
+CUBE_TABLE = "_cube"
+ACTIVITY_TABLE = "_activity"
+
+DAY_PARTITIONING = ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive")
+
+# GMP calls can be executed a while after they were created, so refreshes
+# re-read a few days behind the watermark.
+DEFAULT_LOOKBACK_DAYS = 2
+
+
+def month_chunks(start_date, end_date):
+    """Split ``[start_date, end_date]`` into calendar-month ``(start, end)`` pairs."""
+    start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()
+    chunks = []
+    for month in pd.period_range(start, end, freq="M"):
+        chunks.append((max(month.start_time, start), min(month.end_time.normalize(), end)))
+    return chunks
+
+
+class GMPStore:
+    def __init__(self, root, lookback_days=DEFAULT_LOOKBACK_DAYS, user_sketch="exact"):
+        if user_sketch not in ("exact", "hll"):
+            raise ValueError(f"Unsupported user_sketch: {user_sketch!r}")
+        self.root = root
+        self.lookback_days = lookback_days
+        self.user_sketch = user_sketch
+        self._users_table = "_users_hll" if user_sketch == "hll" else "_users"
+        # re-entrant, so a sync holding it can update the state
+        self.lock = FileLock(os.path.join(root, "_lock"))
+        self._build_lock = threading.Lock()
+        self._footers = {}
+        os.makedirs(root, exist_ok=True)
+        self.dictionary = CodeDictionary(os.path.join(root, "_user_dictionary.parquet"))
+        self.routes = CodeDictionary(os.path.join(root, "_route_dictionary.parquet"), column="route")
+        self.first_seen = FirstSeenIndex(os.path.join(root, "_first_seen.parquet"))
+        if not self.first_seen.exists and self.days():
+            self._rebuild_first_seen()
+
+    # --- State ----------------------------------------------------------------------------------------------------
+    @property
+    def _state_path(self):
+        return os.path.join(self.root, "_state.json")
+
+    def _read_state(self):
+        try:
+            with open(self._state_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"watermark": None, "backfilled": {}}
+
+    def _write_state(self, state):
+        tmp = temp_path(self._state_path)
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self._state_path)
+
+    def _update_state(self, **changes):
+        with self.lock:
+            state = self._read_state()
+            state.update(changes)
+            self._write_state(state)
+            return state
+
+    def watermark(self):
+        value = self._read_state()["watermark"]
+        return pd.Timestamp(value) if value else None
+
+    # --- Partitions -----------------------------------------------------------------------------------------------
+    def _partition_dir(self, day, table=""):
+        return os.path.join(self.root, table, f"day={pd.Timestamp(day):%Y-%m-%d}")
+
+    def _partition_days(self, table=""):
+        path = os.path.join(self.root, table)
+        if not os.path.isdir(path):
+            return []
+        return sorted(name[4:] for name in os.listdir(path) if name.startswith("day="))
+
+    def days(self):
+        return self._partition_days()
+
+    @staticmethod
+    def _write_partition(path, df, schema, keep_empty=False):
+        """Replace the partition at ``path`` with ``df``; an empty ``df`` removes it unless ``keep_empty``."""
+        if df.empty and not keep_empty:
+            shutil.rmtree(path, ignore_errors=True)
+            return
+        os.makedirs(path, exist_ok=True)
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        tmp = temp_path(os.path.join(path, "part.parquet"))
+        pq.write_table(table, tmp)
+        os.replace(tmp, os.path.join(path, "part.parquet"))
+
+    def _derive(self, df):
+        """Per-day tables derived from raw rows: ``{table: (frame, schema)}``."""
+        user_sets = build_user_sets(df, self.dictionary)
+        self.first_seen.update(user_sets["user_code"], user_sets["day"])
+        if self.user_sketch == "hll":
+            users = (build_user_hll(user_sets), USER_HLL_SCHEMA)
+        else:
+            users = (user_sets, USER_SET_SCHEMA)
+        return {
+            CUBE_TABLE: (build_cube(df), CUBE_SCHEMA),
+            ACTIVITY_TABLE: (build_activity(df, self.dictionary, self.routes), ACTIVITY_SCHEMA),
+            self._users_table: users,
+        }
+
+    def _write_tables(self, days, tables, built=()):
+        # a derived table of a day in ``built`` (one with raw rows) is written even without rows,
+        # e.g. the user sets of a day whose users are all null, so the day is not taken as unbuilt
+        built = set(built)
+        for table, (frame, key, schema) in tables.items():
+            by_day = dict(tuple(frame.groupby(key)))
+            for day in days:
+                keep_empty = bool(table) and day in built
+                self._write_partition(
+                    self._partition_dir(day, table), by_day.get(day, frame.iloc[:0]), schema, keep_empty)
+
+    def write_range(self, start_date, end_date, df):
+        """Replace every day partition in ``[start_date, end_date]`` (raw rows and derived tables) with ``df``."""
+        tables = {"": (df[GMP_COLUMNS], df["created_at"].dt.normalize(), GMP_SCHEMA)}
+        for table, (frame, schema) in self._derive(df).items():
+            tables[table] = (frame, frame["day"], schema)
+        self._write_tables(pd.date_range(start_date, end_date, freq="D"), tables, df["created_at"].dt.normalize())
+
+    def _latest_created_at(self):
+        days = self.days()
+        if not days:
+            return None
+        latest = pq.read_table(os.path.join(self._partition_dir(days[-1]), "part.parquet"), columns=["created_at"])
+        return latest.column("created_at").to_pandas().max()
+
+    def read(self, start_date, end_date, columns=GMP_COLUMNS):
+        """Raw rows of the given days, reading only ``columns`` from disk."""
+        start, end = f"{pd.Timestamp(start_date):%Y-%m-%d}", f"{pd.Timestamp(end_date):%Y-%m-%d}"
+        return self._read_days("", gmp_schema(columns), [day for day in self.days() if start <= day <= end])
+
+    def _read_days(self, table, schema, days):
+        # open only the partition files of the requested days instead of discovering the whole table
+        if not days:
+            return schema.empty_table().to_pandas()
+        files = [os.path.join(self._partition_dir(day, table), "part.parquet") for day in days]
+        return ds.dataset(files, format="parquet", schema=schema).to_table(columns=schema.names).to_pandas()
+
+    def _read_derived(self, table, schema, start_date, end_date):
+        start, end = f"{pd.Timestamp(start_date):%Y-%m-%d}", f"{pd.Timestamp(end_date):%Y-%m-%d}"
+        # days written before a derived table existed are built from their raw rows on first read;
+        # panels read concurrently, so only one of them builds
+        with self._build_lock:
+            built = set(self._partition_days(table))
+            missing = [day for day in self.days() if start <= day <= end and day not in built]
+            if missing:
+                df = self.read(missing[0], missing[-1])
+                df = df[df["created_at"].dt.strftime("%Y-%m-%d").isin(missing)]
+                frame, _ = self._derive(df)[table]
+                days = pd.to_datetime(missing)
+                self._write_tables(days, {table: (frame, frame["day"], schema)}, days)
+        return self._read_days(table, schema, [day for day in self._partition_days(table) if start <= day <= end])
+
+    def _rebuild_first_seen(self):
+        # stores written before the index existed: one pass over the local rows
+        dataset = ds.dataset(self.root, format="parquet", partitioning=DAY_PARTITIONING)
+        df = dataset.to_table(columns=["user", "created_at"], filter=ds.field("user").is_valid()).to_pandas()
+        self.first_seen.update(self.dictionary.encode(df["user"]), df["created_at"])
+
+    def read_cube(self, start_date, end_date):
+        return self._read_derived(CUBE_TABLE, CUBE_SCHEMA, start_date, end_date)
+
+    def read_activity(self, start_date, end_date):
+        return self._read_derived(ACTIVITY_TABLE, ACTIVITY_SCHEMA, start_date, end_date)
+
+    def read_user_sets(self, start_date, end_date):
+        """Exact user-code sets or HLL sketches per (day, route), depending on ``user_sketch``."""
+        schema = USER_HLL_SCHEMA if self.user_sketch == "hll" else USER_SET_SCHEMA
+        return self._read_derived(self._users_table, schema, start_date, end_date)
+
+    # --- Statistics -----------------------------------------------------------------------------------------------
+    def table_stats(self, source, start_date, end_date):
+        """``(rows, bytes)`` stored for ``source`` ("rows", "cube", "activity" or "user_sets") in the range.
+
+        Taken from Parquet footers without reading any data; days whose derived
+        tables are not built yet count as empty.
+        """
+        table = {"rows": "", "cube": CUBE_TABLE, "activity": ACTIVITY_TABLE, "user_sets": self._users_table}[source]
+        start, end = f"{pd.Timestamp(start_date):%Y-%m-%d}", f"{pd.Timestamp(end_date):%Y-%m-%d}"
+        rows = size = 0
+        for day in self._partition_days(table):
+            if start <= day <= end:
+                day_rows, day_size = self._footer_stats(os.path.join(self._partition_dir(day, table), "part.parquet"))
+                rows += day_rows
+                size += day_size
+        return rows, size
+
+    def _footer_stats(self, path):
+        # partitions are rewritten in place (refreshes), so entries are keyed by mtime as well
+        stat = os.stat(path)
+        cached = self._footers.get(path)
+        if cached is None or cached[0] != stat.st_mtime_ns:
+            cached = self._footers[path] = (stat.st_mtime_ns, pq.read_metadata(path).num_rows, stat.st_size)
+        return cached[1], cached[2]
+
+    # --- Loading --------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _backfilled(state):
+        """``{month: last day loaded}``; older stores list whole months only."""
+        backfilled = state["backfilled"]
+        if isinstance(backfilled, list):
+            return {month: f"{pd.Period(month, 'M').end_time:%Y-%m-%d}" for month in backfilled}
+        return backfilled
+
+    def pending_chunks(self, start_date, end_date):
+        """Month chunks of ``[start_date, end_date]`` not backfilled yet.
+
+        A month loaded only up to some day (the backfill ran that month) resumes
+        the day after.
+        """
+        done = self._backfilled(self._read_state())
+        chunks = []
+        for chunk_start, chunk_end in month_chunks(start_date, end_date):
+            loaded = done.get(f"{chunk_start:%Y-%m}")
+            if loaded is not None:
+                chunk_start = max(chunk_start, pd.Timestamp(loaded) + pd.Timedelta(days=1))
+            if chunk_start <= chunk_end:
+                chunks.append((chunk_start, chunk_end))
+        return chunks
+
+    def commit_chunk(self, chunk_start, chunk_end, df):
+        self.write_range(chunk_start, chunk_end, df)
+        with self.lock:
+            state = self._read_state()
+            backfilled = self._backfilled(state)
+            month, end = f"{pd.Timestamp(chunk_start):%Y-%m}", f"{pd.Timestamp(chunk_end):%Y-%m-%d}"
+            backfilled[month] = max(backfilled.get(month, end), end)
+            state["backfilled"] = dict(sorted(backfilled.items()))
+            self._write_state(state)
+
+    def finish_backfill(self):
+        watermark = self._latest_created_at()
+        if watermark is not None:
+            self._update_state(watermark=watermark.isoformat())
+
+    def refresh_window(self, today=None):
+        """Day range a refresh has to re-read: the watermark day minus the lookback, up to today."""
+        watermark = self.watermark()
+        if watermark is None:
+            raise RuntimeError("GMP store is empty; sync it first")
+        today = pd.Timestamp(today or pd.Timestamp.now("UTC").tz_localize(None)).normalize()
+        return watermark.normalize() - pd.Timedelta(days=self.lookback_days), today
+
+    def commit_refresh(self, start_date, end_date, df):
+        self.write_range(start_date, end_date, df)
+        if not df.empty:
+            self._update_state(watermark=max(self.watermark(), df["created_at"].max()).isoformat())
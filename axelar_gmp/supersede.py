@@ -0,0 +1,70 @@
+"""Rerun generations: loader work of a rerun is dropped once a newer one supersedes it.
+
+Each script run of a session starts a ``Generation`` (``Generations.start``)
+and makes it current with ``set_generation``; worker threads inherit it
+through copied contexts. Loaders call ``check_superseded`` before starting,
+so a superseded rerun stops reading the store. Warehouse queries are not
+cancelled: they only run in the store sync, which every session shares and
+runs ``detached`` from any generation.
+"""
+
+import contextvars
+import threading
+import weakref
+from contextlib import contextmanager
+
+_generation = contextvars.ContextVar("generation", default=None)
+
+
+class Superseded(Exception):
+    """The rerun this work belongs to has been superseded."""
+
+
+class Generation:
+    def __init__(self):
+        self._cancelled = False
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        self._cancelled = True
+
+
+class Generations:
+    """Latest generation of each session; starting a new one cancels the previous."""
+
+    def __init__(self):
+        self._latest = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def start(self, session_id):
+        generation = Generation()
+        with self._lock:
+            previous = self._latest.get(session_id)
+            self._latest[session_id] = generation
+        if previous is not None:
+            previous.cancel()
+        return generation
+
+
+def set_generation(generation):
+    """Make ``generation`` current in this context (and copies of it); ``None`` detaches."""
+    _generation.set(generation)
+
+
+def check_superseded():
+    generation = _generation.get()
+    if generation is not None and generation.cancelled:
+        raise Superseded()
+
+
+@contextmanager
+def detached():
+    """Run the block outside any generation, for work shared by every session."""
+    token = _generation.set(None)
+    try:
+        yield
+    finally:
+        _generation.reset(token)
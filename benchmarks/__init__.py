@@ -0,0 +1 @@
+"""Synthetic ``fact_gmp`` data and timings of the dashboard's data layer on the local engine."""
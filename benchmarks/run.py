@@ -0,0 +1,117 @@
+"""Time every dashboard loader against the DuckDB backend and write a JSON report.
+
+    python -m benchmarks.run --rows 1000000 --report bench.json
+
+The synthetic table is generated once per ``(rows, seed)`` under ``--workdir``
+and reused by later runs. Each loader is timed ``--repeat`` times, then run
+once more under tracemalloc for its peak Python-heap allocation.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import time
+import tracemalloc
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+
+from axelar_gmp.backends import DuckDBBackend, sync_backend
+from axelar_gmp.loaders import LOADERS, StoreSource, rows_returned
+from axelar_gmp.store import GMPStore
+
+from .synthetic import generate_fact_gmp
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def _peak_bytes(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(rows, workdir, start_date, end_date, timeframe="week", repeat=3, seed=0, loaders=None):
+    data_dir = os.path.join(workdir, f"fact_gmp-{rows}-{seed}")
+    if not os.path.isdir(data_dir):
+        # generated next to its final name so an interrupted run is not reused
+        shutil.rmtree(data_dir + ".tmp", ignore_errors=True)
+        generate_fact_gmp(data_dir + ".tmp", rows, seed=seed)
+        os.replace(data_dir + ".tmp", data_dir)
+
+    store_dir = os.path.join(workdir, "store")
+    shutil.rmtree(store_dir, ignore_errors=True)
+    store = GMPStore(store_dir)
+    _, sync_seconds = _timed(lambda: sync_backend(
+        DuckDBBackend(os.path.join(data_dir, "*.parquet")), store, "2022-01-01", today=pd.Timestamp.now()))
+
+    source = StoreSource(store)
+    results = {}
+    for name in loaders or LOADERS:
+        loader = LOADERS[name]
+        call = lambda: loader(source, timeframe, start_date, end_date)  # noqa: E731
+        timings = []
+        for _ in range(repeat):
+            result, seconds = _timed(call)
+            timings.append(seconds)
+        results[name] = {
+            "wall_seconds": timings,
+            "wall_seconds_min": min(timings),
+            "wall_seconds_median": statistics.median(timings),
+            "peak_python_bytes": _peak_bytes(call),
+            "rows": rows_returned(result),
+        }
+
+    return {
+        "meta": {
+            "rows": rows,
+            "seed": seed,
+            "start_date": str(start_date),
+            "end_date": str(end_date),
+            "timeframe": timeframe,
+            "repeat": repeat,
+            "created_at": pd.Timestamp.now("UTC").isoformat(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "pyarrow": pa.__version__,
+            "duckdb": duckdb.__version__,
+        },
+        "sync_seconds": sync_seconds,
+        "loaders": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-date", default="2023-01-01")
+    parser.add_argument("--end-date", default="2025-08-31")
+    parser.add_argument("--timeframe", choices=["day", "week", "month"], default="week")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--loader", action="append", choices=sorted(LOADERS), help="only these loaders")
+    parser.add_argument("--workdir", default=".bench")
+    parser.add_argument("--report", default="bench_report.json")
+    args = parser.parse_args(argv)
+
+    report = run(args.rows, args.workdir, args.start_date, args.end_date, args.timeframe,
+                 args.repeat, args.seed, args.loader)
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    for name, result in report["loaders"].items():
+        print(f"{name:<28} {result['wall_seconds_median']:8.3f}s {result['peak_python_bytes'] / 2**20:9.1f} MiB {result['rows']:>8} rows")
+
+
+if __name__ == "__main__":
+    main()
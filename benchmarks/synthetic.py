@@ -0,0 +1,110 @@
+"""Synthetic ``fact_gmp`` Parquet files for the DuckDB backend.
+
+Rows are generated in chunks with NumPy and serialized by DuckDB, so scales
+of 1M-100M rows stay within a fixed memory budget. Distributions follow the
+shape of the real table: a few chains carry most of the traffic, a few routes
+dominate, wallet activity is heavy-tailed and volumes are log-normal. The
+``data`` column is JSON text with the paths the extract reads.
+"""
+
+import os
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+CHAINS = [
+    "ethereum", "osmosis", "arbitrum", "polygon", "binance", "avalanche", "base", "optimism",
+    "moonbeam", "fantom", "celo", "kava", "filecoin", "linea", "scroll", "mantle",
+    "blast", "fraxtal", "immutable", "centrifuge",
+]
+SYMBOLS = ["USDC", "axlUSDC", "USDT", "WETH", "AXL", "WBTC", "DAI", "ATOM", None]
+STATUSES = ["executed", "error", "approved", "called"]
+SIMPLIFIED_STATUSES = ["received", "failed", "approved", "called"]
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def zipf_weights(n, skew):
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+
+def _chunk(rng, offset, rows, start, end, wallets):
+    """One chunk of raw columns covering ``[start, end)``."""
+    chains = len(CHAINS)
+    source = rng.choice(chains, rows, p=zipf_weights(chains, 1.1))
+    # destinations are skewed too and never equal the source chain
+    destination = rng.choice(chains - 1, rows, p=zipf_weights(chains - 1, 0.9))
+    destination = np.where(destination >= source, destination + 1, destination)
+
+    seconds = int((end - start).total_seconds())
+    created_at = start.to_datetime64() + np.sort(rng.integers(0, seconds, rows)).astype("timedelta64[s]")
+    value = rng.lognormal(mean=4.0, sigma=2.2, size=rows)
+    price = rng.lognormal(mean=0.0, sigma=1.0, size=rows)
+    status = rng.choice(len(STATUSES), rows, p=[0.92, 0.04, 0.02, 0.02])
+
+    return pa.table({
+        "created_at": pa.array(created_at.astype("datetime64[us]")),
+        "id": pa.array(np.arange(offset, offset + rows, dtype=np.int64)),
+        "status": pa.DictionaryArray.from_arrays(status.astype(np.int8), STATUSES).cast(pa.string()),
+        "simplified_status": pa.DictionaryArray.from_arrays(status.astype(np.int8), SIMPLIFIED_STATUSES).cast(pa.string()),
+        # wallet ids are Zipf distributed: a handful of wallets send most transfers
+        "wallet": pa.array(np.minimum(rng.zipf(1.6, rows), wallets) + rng.integers(0, 8, rows) * wallets),
+        "source_chain": pa.array(np.asarray(CHAINS, dtype=object)[source]),
+        "destination_chain": pa.array(np.asarray(CHAINS, dtype=object)[destination]),
+        "symbol": pa.array(np.asarray(SYMBOLS, dtype=object)[rng.integers(0, len(SYMBOLS), rows)]),
+        "amount": pa.array(value / price),
+        # about 5% of calls carry no USD value
+        "value": pa.array(np.where(rng.random(rows) < 0.05, np.nan, value), from_pandas=True),
+        "gas_used_amount": pa.array(rng.exponential(0.002, rows)),
+        "gas_price": pa.array(price),
+        "express_fee_usd": pa.array(np.where(rng.random(rows) < 0.1, rng.exponential(0.5, rows), np.nan), from_pandas=True),
+    })
+
+
+# chain names are stored upper-cased in part of the real table; the extract lower-cases them
+_TO_FACT_GMP = """
+SELECT
+  created_at,
+  CAST(id AS VARCHAR) AS id,
+  status,
+  simplified_status,
+  json_object(
+    'call', json_object(
+      'chain', CASE WHEN id % 3 = 0 THEN upper(source_chain) ELSE source_chain END,
+      'transaction', json_object('from', printf('0x%040x', wallet)),
+      'returnValues', json_object('destinationChain', destination_chain)
+    ),
+    'amount', amount,
+    'value', value,
+    'symbol', symbol,
+    'gas', json_object('gas_used_amount', gas_used_amount),
+    'gas_price_rate', json_object('source_token', json_object('token_price', json_object('usd', gas_price))),
+    'fees', json_object('express_fee_usd', express_fee_usd)
+  ) AS data
+FROM chunk
+"""
+
+
+def generate_fact_gmp(path, rows, start_date="2022-01-01", end_date="2025-08-31", seed=0,
+                      chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Write ``rows`` synthetic ``fact_gmp`` rows to ``<path>/part-NNNNN.parquet``; returns the glob."""
+    os.makedirs(path, exist_ok=True)
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    rng = np.random.default_rng(seed)
+    wallets = max(rows // 20, 1)
+    conn = duckdb.connect()
+    chunks = max(-(-rows // chunk_rows), 1)
+    # each chunk covers its own slice of time, so files are ordered by created_at
+    bounds = pd.date_range(start, end, periods=chunks + 1)
+    for i in range(chunks):
+        offset = i * chunk_rows
+        chunk = _chunk(rng, offset, min(chunk_rows, rows - offset), bounds[i], bounds[i + 1], wallets)
+        conn.register("chunk", chunk)
+        target = os.path.join(path, f"part-{i:05d}.parquet").replace("'", "''")
+        conn.execute(f"COPY ({_TO_FACT_GMP}) TO '{target}' (FORMAT PARQUET)")
+        conn.unregister("chunk")
+    conn.close()
+    return os.path.join(path, "*.parquet")
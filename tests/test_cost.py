@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from axelar_gmp import downsample
+from axelar_gmp.cost import buckets, coarsen, max_buckets
+
+POINT_BUDGET = 500
+DEFAULT_RANGE = ("2023-01-01", "2025-08-31")
+
+
+def test_multi_year_day_range_is_not_coarsened():
+    assert buckets(*DEFAULT_RANGE, "day") > POINT_BUDGET
+    assert coarsen("day", *DEFAULT_RANGE, max_buckets(POINT_BUDGET)) == "day"
+
+
+def test_coarsen_still_caps_very_long_ranges():
+    assert coarsen("day", "2000-01-01", "2025-08-31", max_buckets(POINT_BUDGET)) == "week"
+
+
+def test_multi_year_day_series_reaches_lttb(monkeypatch):
+    calls = []
+    lttb_indices = downsample.lttb_indices
+
+    def recording(x, y, budget):
+        calls.append((len(x), budget))
+        return lttb_indices(x, y, budget)
+
+    monkeypatch.setattr(downsample, "lttb_indices", recording)
+    timeframe = coarsen("day", *DEFAULT_RANGE, max_buckets(POINT_BUDGET))
+    dates = pd.date_range(*DEFAULT_RANGE, freq="D")
+    series = pd.DataFrame({"Date": dates, "Total Volume": np.random.default_rng(0).random(len(dates))})
+
+    points = downsample.downsample(series, "Date", "Total Volume", POINT_BUDGET)
+
+    assert timeframe == "day"
+    assert calls == [(len(dates), POINT_BUDGET)]
+    assert len(points) == POINT_BUDGET
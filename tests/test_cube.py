@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from axelar_gmp import panels
+from axelar_gmp.cube import build_cube, rollup
+from axelar_gmp.store import GMPStore
+from axelar_gmp.sql import GMP_COLUMNS
+
+ROUTE = ["source_chain", "destination_chain"]
+
+
+def gmp_rows(rows):
+    df = pd.DataFrame(rows, columns=GMP_COLUMNS)
+    df["created_at"] = pd.to_datetime(df["created_at"]).astype("datetime64[us]")
+    return df
+
+
+@pytest.fixture
+def gmp():
+    # the second transfer has no destination chain
+    return gmp_rows([
+        ("2024-01-01 10:00", "a", "0xa", "ethereum", "osmosis", 10.0, 1.0, "uusdc"),
+        ("2024-01-01 11:00", "b", "0xb", "ethereum", None, 20.0, 1.0, "uusdc"),
+        ("2024-01-02 10:00", "c", "0xa", "ethereum", "osmosis", 30.0, 1.0, "uusdc"),
+    ])
+
+
+def test_rollup_keeps_null_chain_rows(gmp):
+    cube = build_cube(gmp)
+    by_date = rollup(cube, ["Date"], "day")
+    assert by_date["tx_count"].sum() == 3
+    assert by_date["volume_usd"].sum() == 60.0
+
+    by_route = rollup(cube, ROUTE)
+    assert len(by_route) == 2
+    null_route = by_route[by_route["destination_chain"].isna()]
+    assert null_route["tx_count"].tolist() == [1]
+    assert null_route["volume_usd"].tolist() == [20.0]
+
+
+@pytest.mark.parametrize("sketch", ["exact", "hll"])
+def test_route_panels_keep_null_chain_rows(tmp_path, gmp, sketch):
+    store = GMPStore(str(tmp_path), user_sketch=sketch)
+    store.write_range("2024-01-01", "2024-01-02", gmp)
+    cube, user_sets = store.read_cube("2024-01-01", "2024-01-02"), store.read_user_sets("2024-01-01", "2024-01-02")
+
+    top = panels.top_path_data(cube, user_sets)
+    assert top["Number of Transfers"].sum() == 3
+    assert top["Number of Users"].tolist() == [1, 1]
+
+    paths = panels.path_data_from_cube(cube, user_sets)
+    assert paths["Number of Transfers"].sum() == 3
+    assert paths["Active Days"].tolist() == [2, 1]
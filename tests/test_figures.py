@@ -0,0 +1,30 @@
+import pandas as pd
+import plotly.express as px
+
+from axelar_gmp.figures import FigureCache
+
+
+def test_builders_calling_different_functions_are_not_shared():
+    df = pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=3), "Total Volume": [1, 2, 3]})
+    cache = FigureCache()
+
+    def build():
+        return px.bar(df, x="Date", y="Total Volume")
+    bar = cache.get(build, df)
+
+    def build():  # noqa: F811 - the same builder after an edit
+        return px.line(df, x="Date", y="Total Volume")
+    line = cache.get(build, df)
+
+    assert bar.data[0].type == "bar"
+    assert line.data[0].type == "scatter"
+
+
+def test_unchanged_builder_and_inputs_reuse_the_figure():
+    df = pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=3), "Total Volume": [1, 2, 3]})
+    cache = FigureCache()
+
+    def build():
+        return px.bar(df, x="Date", y="Total Volume")
+
+    assert cache.get(build, df) is cache.get(build, df)
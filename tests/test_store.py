@@ -0,0 +1,71 @@
+import os
+
+import pandas as pd
+import pytest
+
+from axelar_gmp.store import ACTIVITY_TABLE, GMPStore
+from axelar_gmp.sql import GMP_COLUMNS
+
+
+def gmp_rows(rows):
+    df = pd.DataFrame(rows, columns=GMP_COLUMNS)
+    df["created_at"] = pd.to_datetime(df["created_at"]).astype("datetime64[us]")
+    return df
+
+
+def write_null_user_day(store):
+    # 2024-01-02 has a transfer, but no user on any of its rows
+    store.write_range("2024-01-01", "2024-01-02", gmp_rows([
+        ("2024-01-01 10:00", "a", "0xa", "ethereum", "osmosis", 10.0, 1.0, "uusdc"),
+        ("2024-01-02 10:00", "b", None, "ethereum", "osmosis", 20.0, 1.0, "uusdc"),
+    ]))
+    return store
+
+
+def count_derives(store):
+    derived = []
+    store._derive = lambda df: derived.append(df) or GMPStore._derive(store, df)
+    return derived
+
+
+@pytest.fixture
+def store_with_null_user_day(tmp_path):
+    return write_null_user_day(GMPStore(str(tmp_path)))
+
+
+@pytest.mark.parametrize("sketch", ["exact", "hll"])
+def test_all_null_user_day_is_built_once(tmp_path, sketch):
+    store = write_null_user_day(GMPStore(str(tmp_path), user_sketch=sketch))
+    assert os.path.exists(os.path.join(store._partition_dir("2024-01-02", store._users_table), "part.parquet"))
+
+    derived = count_derives(store)
+    user_sets = store.read_user_sets("2024-01-01", "2024-01-02")
+    activity = store.read_activity("2024-01-01", "2024-01-02")
+
+    assert derived == []
+    assert set(user_sets["day"]) == {pd.Timestamp("2024-01-01")}
+    assert len(activity) == 1
+
+
+def test_unbuilt_null_user_day_is_built_on_first_read_only(store_with_null_user_day):
+    store = store_with_null_user_day
+    # a store written before the activity table existed
+    for day in store.days():
+        os.remove(os.path.join(store._partition_dir(day, ACTIVITY_TABLE), "part.parquet"))
+        os.rmdir(store._partition_dir(day, ACTIVITY_TABLE))
+
+    derived = count_derives(store)
+    first = store.read_activity("2024-01-01", "2024-01-02")
+    second = store.read_activity("2024-01-01", "2024-01-02")
+
+    assert len(derived) == 1
+    assert first.equals(second)
+    assert store._partition_days(ACTIVITY_TABLE) == ["2024-01-01", "2024-01-02"]
+
+
+def test_days_without_rows_have_no_partitions(store_with_null_user_day):
+    store = store_with_null_user_day
+    store.write_range("2024-01-02", "2024-01-02", gmp_rows([]))
+
+    assert store.days() == ["2024-01-01"]
+    assert store._partition_days(ACTIVITY_TABLE) == ["2024-01-01"]